@@ -1,30 +1,70 @@
-from pathlib import Path
-from random import randint
+import os
 import secrets
-from diary.models import Notebook, NotebookDAO, Page, PageElement, Point, Stroke
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, pairwise
+from pathlib import Path
+
+from diary.models import Notebook, Page, PageElement, Point, Stroke
+from diary.models.asset import AssetIndex
+from diary.models.dao.archive_dao import ArchiveDAO
 from diary.utils.encryption import SecureEncryption
 
+NUM_PAGES = 100
+STROKES_PER_PAGE = 50
+MAX_POINTS_PER_STROKE = 100
 
-def create_large_notebook():
-    NUM_PAGES = 100
-    STROKES_PER_PAGE = 50
-    MAX_POINTS_PER_STROKE = 100
 
-    notebook = Notebook()
+def random_ints(count: int, upper: int) -> array:
+    """Draw count ints in [0, upper] from a single os.urandom() call.
+
+    The modulo bias is irrelevant for test data.
+    """
+    raw = array("H", os.urandom(2 * count))
+    return array("i", [value % (upper + 1) for value in raw])
+
 
-    for _ in range(NUM_PAGES):
-        strokes: list[PageElement] = []
-        for _ in range(STROKES_PER_PAGE):
-            points: list[Point] = []
-            for _ in range(randint(0, MAX_POINTS_PER_STROKE)):
-                points.append(Point(randint(0, 800), randint(0, 1100), 1.0))
-            strokes.append(Stroke(points=points))
-        notebook.pages.append(Page(elements=strokes))
+def generate_page(_page_number: int) -> Page:
+    """Generate one page of random strokes (runs in a worker process)"""
+    # Draw all the random values at once into flat buffers (one per coordinate),
+    # then slice them per stroke instead of calling randint for every point
+    counts = random_ints(STROKES_PER_PAGE, MAX_POINTS_PER_STROKE)
+    total_points = sum(counts)
+    xs = random_ints(total_points, 800)
+    ys = random_ints(total_points, 1100)
+
+    # Each stroke takes the next counts[i] values of the buffers
+    strokes: list[PageElement] = [
+        make_stroke(xs[start:end], ys[start:end])
+        for start, end in pairwise(accumulate(counts, initial=0))
+    ]
+    return Page(elements=strokes)
+
+
+def make_stroke(xs: array, ys: array) -> Stroke:
+    """Build a stroke through the given coordinates"""
+    return Stroke(points=[Point(x, y, 1.0) for x, y in zip(xs, ys)])
+
+
+def create_large_notebook():
+    # Pages are independent, so generate them across all cores
+    with ProcessPoolExecutor() as executor:
+        pages = list(executor.map(generate_page, range(NUM_PAGES), chunksize=10))
+    notebook = Notebook(pages=pages)
 
     salt = secrets.token_bytes(SecureEncryption.SALT_SIZE)
     key_buffer = SecureEncryption.derive_key("test", salt)
 
-    NotebookDAO.save(notebook, Path("data/test_notebook.enc"), key_buffer, salt)
+    output_path = Path("data/test_notebook.enc")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    ArchiveDAO.save_all(
+        [notebook],
+        {notebook.notebook_id: AssetIndex()},
+        output_path,
+        key_buffer,
+        salt,
+    )
 
 
-create_large_notebook()
+if __name__ == "__main__":
+    create_large_notebook()
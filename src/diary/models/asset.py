@@ -2,9 +2,10 @@
 
 import hashlib
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any
+from typing import Any, BinaryIO
 
 
 class AssetType(Enum):
@@ -15,7 +16,7 @@ class AssetType(Enum):
     AUDIO = "audio"
 
 
-@dataclass
+@dataclass(slots=True)
 class Asset:
     """Represents a binary asset stored separately from page data"""
 
@@ -28,12 +29,24 @@ class Asset:
     def __post_init__(self) -> None:
         """Calculate checksum if data is present and checksum is not set"""
         if self.data is not None and self.checksum is None:
-            self.checksum = self._calculate_checksum(self.data)
+            self.checksum = self.calculate_checksum(self.data)
+
+    HASH_CHUNK_SIZE = 1024 * 1024  # 1 MiB per update() when hashing a stream
 
     @staticmethod
-    def _calculate_checksum(data: bytes) -> str:
-        """Calculate SHA-256 checksum of data"""
-        return hashlib.sha256(data).hexdigest()
+    def calculate_checksum(src: bytes | bytearray | memoryview | BinaryIO) -> str:
+        """Calculate SHA-256 checksum of raw bytes or a binary file object.
+
+        File objects are hashed in 1 MiB chunks so large videos never have to
+        be fully resident in memory just to be checksummed.
+        """
+        sha = hashlib.sha256()
+        if isinstance(src, (bytes, bytearray, memoryview)):
+            sha.update(src)
+        else:
+            while chunk := src.read(Asset.HASH_CHUNK_SIZE):
+                sha.update(chunk)
+        return sha.hexdigest()
 
     @classmethod
     def create(
@@ -41,29 +54,41 @@ class Asset:
         asset_type: AssetType,
         mime_type: str,
         data: bytes,
+        *,
+        checksum: str | None = None,
     ) -> "Asset":
-        """Create a new Asset with generated UUID"""
+        """Create a new Asset with generated UUID.
+
+        Pass checksum when it is already known to skip hashing the data.
+        """
         return cls(
             asset_id=uuid.uuid4().hex,
             asset_type=asset_type,
             mime_type=mime_type,
             data=data,
+            checksum=checksum,
         )
 
     @classmethod
-    def from_image_bytes(cls, data: bytes, mime_type: str = "image/png") -> "Asset":
+    def from_image_bytes(
+        cls, data: bytes, mime_type: str = "image/png", *, checksum: str | None = None
+    ) -> "Asset":
         """Create an image asset from raw bytes"""
-        return cls.create(AssetType.IMAGE, mime_type, data)
+        return cls.create(AssetType.IMAGE, mime_type, data, checksum=checksum)
 
     @classmethod
-    def from_audio_bytes(cls, data: bytes, mime_type: str = "audio/wav") -> "Asset":
+    def from_audio_bytes(
+        cls, data: bytes, mime_type: str = "audio/wav", *, checksum: str | None = None
+    ) -> "Asset":
         """Create an audio asset from raw bytes"""
-        return cls.create(AssetType.AUDIO, mime_type, data)
+        return cls.create(AssetType.AUDIO, mime_type, data, checksum=checksum)
 
     @classmethod
-    def from_video_bytes(cls, data: bytes, mime_type: str = "video/mp4") -> "Asset":
+    def from_video_bytes(
+        cls, data: bytes, mime_type: str = "video/mp4", *, checksum: str | None = None
+    ) -> "Asset":
         """Create a video asset from raw bytes"""
-        return cls.create(AssetType.VIDEO, mime_type, data)
+        return cls.create(AssetType.VIDEO, mime_type, data, checksum=checksum)
 
     def to_manifest_entry(self) -> dict[str, Any]:
         """Return manifest entry (metadata only, no binary data)"""
@@ -92,10 +117,10 @@ class Asset:
         """Verify that the data matches the stored checksum"""
         if self.data is None or self.checksum is None:
             return False
-        return self._calculate_checksum(self.data) == self.checksum
+        return self.calculate_checksum(self.data) == self.checksum
 
 
-@dataclass
+@dataclass(slots=True)
 class AssetIndex:
     """Index of all assets in an archive"""
 
@@ -122,6 +147,20 @@ class AssetIndex:
     def __len__(self) -> int:
         return len(self.assets)
 
+    def verify_all(self, parallel: bool = True) -> list[str]:
+        """Verify the checksum of every asset, returning the IDs that fail.
+
+        hashlib releases the GIL while hashing, so with parallel=True the
+        assets are hashed concurrently on a thread pool.
+        """
+        assets = list(self.assets.values())
+        if parallel and len(assets) > 1:
+            with ThreadPoolExecutor() as executor:
+                results = list(executor.map(Asset.verify_checksum, assets))
+        else:
+            results = [asset.verify_checksum() for asset in assets]
+        return [asset.asset_id for asset, ok in zip(assets, results) if not ok]
+
     def to_manifest_entries(self) -> list[dict[str, Any]]:
         """Return list of manifest entries for all assets"""
         return [asset.to_manifest_entry() for asset in self.assets.values()]
@@ -0,0 +1,152 @@
+"""
+Archive header and the container of entries inside an archive.
+
+Header: magic (10 bytes), version (<H) and salt (32 bytes).
+
+Version 3 (DIARYARC03) container, a flat list of entries:
+- Entry header (name length <I, entry type <B, data length <Q)
+- Name (UTF-8), then data
+- An all-zero entry header marks the end
+
+Version 2 (DIARYARC02) archives hold a TAR with the same entries instead.
+"""
+
+import struct
+import tarfile
+from collections.abc import Iterator
+from typing import IO
+
+from diary.utils import encryption
+
+MAGIC: bytes = b"DIARYARC03"
+VERSION: int = 3
+TAR_MAGIC: bytes = b"DIARYARC02"
+TAR_VERSION: int = 2
+HEADER_SIZE: int = 10 + 2 + 32  # magic + version + salt
+
+# Precompiled little-endian codec for the header version
+_U16 = struct.Struct("<H")
+# Container entry header: name length, entry type, data length
+_ENTRY_HEADER = struct.Struct("<IBQ")
+ENTRY_FILE = 0
+ENTRY_LINK = 1  # data is the name of an earlier entry with the same bytes
+
+
+def build_header(salt: bytes) -> bytes:
+    """Header of a current (version 3) archive"""
+    return MAGIC + _U16.pack(VERSION) + salt
+
+
+def parse_header(header: bytes) -> tuple[int, bytes]:
+    """
+    Verify an archive header (magic + version + salt).
+
+    Returns:
+        Tuple of (archive version, salt)
+    """
+    magic = header[: len(MAGIC)]
+    if magic == MAGIC:
+        expected_version = VERSION
+    elif magic == TAR_MAGIC:
+        expected_version = TAR_VERSION
+    else:
+        raise ValueError(f"Invalid archive format: wrong magic bytes {magic!r}")
+
+    if len(header) < len(MAGIC) + _U16.size:
+        raise ValueError("Invalid archive: truncated header")
+    version = _U16.unpack_from(header, len(MAGIC))[0]
+    if version != expected_version:
+        raise ValueError(f"Unsupported archive version: {version}")
+
+    salt = header[len(MAGIC) + _U16.size : HEADER_SIZE]
+    if len(salt) != encryption.SecureEncryption.SALT_SIZE:
+        raise ValueError("Invalid archive: truncated salt")
+
+    return version, salt
+
+
+def write_entry(
+    fileobj: IO[bytes], name: str, data: bytes, entry_type: int = ENTRY_FILE
+) -> None:
+    """Write a container entry (header, name, data) straight to fileobj"""
+    name_bytes = name.encode()
+    _ = fileobj.write(_ENTRY_HEADER.pack(len(name_bytes), entry_type, len(data)))
+    _ = fileobj.write(name_bytes)
+    _ = fileobj.write(data)
+
+
+def write_end(fileobj: IO[bytes]) -> None:
+    """Write the end-of-container marker"""
+    _ = fileobj.write(_ENTRY_HEADER.pack(0, ENTRY_FILE, 0))
+
+
+def iter_container_entries(stream: IO[bytes]) -> Iterator[tuple[str, bytes]]:
+    """
+    Yield (name, data) for each entry of a container stream.
+
+    Links are resolved to the bytes of the entry they point at.
+    """
+    # Only assets are ever linked, pages and manifests are not kept
+    assets: dict[str, bytes] = {}
+
+    while True:
+        name_size, entry_type, data_size = _ENTRY_HEADER.unpack(
+            _read_exact(stream, _ENTRY_HEADER.size)
+        )
+        if name_size == 0:
+            return
+
+        name = _read_exact(stream, name_size).decode()
+        data = _read_exact(stream, data_size)
+
+        if entry_type == ENTRY_LINK:
+            target = data.decode()
+            if target not in assets:
+                continue
+            data = assets[target]
+
+        if "/assets/" in name:
+            assets[name] = data
+        yield name, data
+
+
+def iter_tar_entries(tar_stream: IO[bytes]) -> Iterator[tuple[str, bytes]]:
+    """
+    Yield (name, data) for each file of a version 2 TAR stream.
+
+    The stream is read strictly forward, so it does not need to be seekable.
+    """
+    # Asset bytes by entry name, to resolve the hard links of duplicates
+    extracted_assets: dict[str, bytes] = {}
+
+    with tarfile.open(fileobj=tar_stream, mode="r|") as tar:
+        for member in tar:
+            name = member.name
+
+            if member.islnk():
+                if member.linkname not in extracted_assets:
+                    continue
+                data = extracted_assets[member.linkname]
+            elif member.isfile():
+                file_obj = tar.extractfile(member)
+                if file_obj is None:
+                    continue
+                data = file_obj.read()
+            else:
+                continue
+
+            if name.endswith(".bin"):
+                extracted_assets[name] = data
+
+            yield name, data
+
+
+def _read_exact(stream: IO[bytes], size: int) -> bytes:
+    """Read exactly size bytes from stream, which may return short reads"""
+    data = stream.read(size)
+    while len(data) < size:
+        more = stream.read(size - len(data))
+        if not more:
+            raise ValueError("Invalid archive: truncated entry")
+        data += more
+    return data
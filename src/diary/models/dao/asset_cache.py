@@ -1,5 +1,8 @@
 """Asset cache for incremental saves"""
 
+from collections.abc import Mapping
+from types import MappingProxyType
+
 from diary.models.asset import Asset, AssetIndex
 
 
@@ -34,11 +37,17 @@ class AssetCache:
     def set_asset_bytes(
         self, asset_id: str, data: bytes, checksum: str | None = None
     ) -> None:
-        """Cache asset bytes"""
+        """Cache asset bytes, skipping the write if the checksum is unchanged"""
+        if checksum and self.is_unchanged(asset_id, checksum):
+            return
         self._asset_bytes[asset_id] = data
         if checksum:
             self._checksums[asset_id] = checksum
 
+    def is_unchanged(self, asset_id: str, checksum: str) -> bool:
+        """Whether the cached bytes for asset_id have the given checksum"""
+        return self._checksums.get(asset_id) == checksum
+
     def add_asset(self, asset: Asset) -> None:
         """Add an asset to the cache"""
         if asset.data is not None:
@@ -56,9 +65,16 @@ class AssetCache:
         self._asset_bytes.clear()
         self._checksums.clear()
 
-    def get_all_bytes(self) -> dict[str, bytes]:
-        """Get all cached asset bytes for incremental save"""
-        return dict(self._asset_bytes)
+    def get_all_bytes(self, copy: bool = False) -> Mapping[str, bytes]:
+        """
+        Get all cached asset bytes for incremental save.
+
+        Returns a read-only live view of the cache, pass copy=True
+        for a snapshot that doesn't follow later changes.
+        """
+        if copy:
+            return dict(self._asset_bytes)
+        return MappingProxyType(self._asset_bytes)
 
     def __contains__(self, asset_id: str) -> bool:
         return asset_id in self._asset_bytes
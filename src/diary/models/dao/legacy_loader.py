@@ -1,16 +1,34 @@
 """Legacy encrypted notebook loader (used only for migration)"""
 
 import logging
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Callable, cast
 
 import msgpack
-import zstd
+import zstandard
 
 from diary.models.notebook import Notebook
 from diary.models.page import Page
 from diary.utils import encryption
 
+_LOGGER: logging.Logger = logging.getLogger("LegacyLoader")
+
+
+def _open_unpacker(chunks: Iterator[bytes]) -> msgpack.Unpacker:
+    """Unpack a legacy zstd frame while it is being decrypted and decompressed"""
+    reader = zstandard.ZstdDecompressor().stream_reader(
+        encryption.ChunkIteratorReader(chunks)
+    )
+    # A whole notebook is a single msgpack object, so don't cap the buffer
+    return msgpack.Unpacker(reader, raw=False, max_buffer_size=0)
+
+
+def _drain(chunks: Iterator[bytes]) -> None:
+    """Decrypt the chunks left after the notebooks, to still authenticate them"""
+    for _ in chunks:
+        pass
+
 
 def load_legacy_notebook(
     filepath: Path,
@@ -19,21 +37,17 @@ def load_legacy_notebook(
 ) -> Notebook:
     """Load a legacy encrypted notebook using the derived key."""
     if not filepath.exists():
-        logging.getLogger("LegacyLoader").debug(
-            "Notebook does not exist, returning a new notebook"
-        )
+        _LOGGER.debug("Notebook does not exist, returning a new notebook")
         return Notebook(pages=[Page()])
 
-    logging.getLogger("LegacyLoader").debug("Loading legacy format")
-    notebook_data = encryption.SecureEncryption.decrypt_file(
+    _LOGGER.debug("Loading legacy format")
+    notebook_chunks = encryption.SecureEncryption.iter_decrypted_chunks(
         filepath, key_buffer, progress
     )
-    uncompressed_notebook = zstd.decompress(notebook_data)
-    notebook_unpacked = cast(
-        dict[str, str], msgpack.unpackb(uncompressed_notebook, raw=False)
-    )
+    notebook_unpacked = cast(dict[str, str], _open_unpacker(notebook_chunks).unpack())
+    _drain(notebook_chunks)
     notebook = Notebook.from_dict(notebook_unpacked)
-    logging.getLogger("LegacyLoader").debug("Legacy decryption completed successfully")
+    _LOGGER.debug("Legacy decryption completed successfully")
     return notebook
 
 
@@ -44,26 +58,28 @@ def load_legacy_notebooks(
 ) -> list[Notebook]:
     """Load legacy encrypted notebooks using the derived key."""
     if not filepath.exists():
-        logging.getLogger("LegacyLoader").debug(
-            "Notebooks file does not exist, returning empty list"
-        )
+        _LOGGER.debug("Notebooks file does not exist, returning empty list")
         return [Notebook([Page()])]  # Return one notebook with one page
 
-    logging.getLogger("LegacyLoader").debug("Notebooks file exists, decrypting")
-    notebooks_data = encryption.SecureEncryption.decrypt_file(
+    _LOGGER.debug("Notebooks file exists, decrypting")
+    notebooks_chunks = encryption.SecureEncryption.iter_decrypted_chunks(
         filepath, key_buffer, progress
     )
-    uncompressed_notebooks = zstd.decompress(notebooks_data)
-    notebooks_unpacked = msgpack.unpackb(uncompressed_notebooks, raw=False)
-    if isinstance(notebooks_unpacked, dict):
-        logging.getLogger("LegacyLoader").debug(
-            "Decryption completed successfully! 1 notebook found"
-        )
-        return [Notebook.from_dict(cast(dict[str, str], notebooks_unpacked))]
+    unpacker = _open_unpacker(notebooks_chunks)
+    try:
+        notebook_count = unpacker.read_array_header()
+    except ValueError:
+        # Not a list, the file holds a single notebook
+        notebooks = [Notebook.from_dict(cast(dict[str, str], unpacker.unpack()))]
+    else:
+        # Unpack the notebooks one by one, so only one raw dict is alive at a time
+        notebooks = [
+            Notebook.from_dict(cast(dict[str, str], unpacker.unpack()))
+            for _ in range(notebook_count)
+        ]
+    _drain(notebooks_chunks)
 
-    notebook_dicts = cast(list[dict[str, str]], notebooks_unpacked)
-    logging.getLogger("LegacyLoader").debug(
-        "Decryption completed successfully! %s notebooks found",
-        len(notebook_dicts),
+    _LOGGER.debug(
+        "Decryption completed successfully! %s notebooks found", len(notebooks)
     )
-    return [Notebook.from_dict(notebook_dict) for notebook_dict in notebook_dicts]
+    return notebooks
@@ -2,7 +2,7 @@
 
 import logging
 from pathlib import Path
-from typing import Callable
+from typing import Callable, cast
 
 from diary.models.asset import Asset, AssetIndex, AssetType
 from diary.models.dao.archive_dao import ArchiveDAO
@@ -11,62 +11,75 @@ from diary.models.elements.image import Image
 from diary.models.elements.video import Video
 from diary.models.elements.voice_memo import VoiceMemo
 from diary.models.notebook import Notebook
+from diary.models.page_element import PageElement
 from diary.utils import encryption
 
+_LOGGER: logging.Logger = logging.getLogger("Migration")
+
+# Magic-byte signatures as (offset, signature, offset, signature, MIME type).
+# The second check is for RIFF/ftyp containers whose kind sits further in;
+# an empty signature at offset 0 always matches. startswith() compares in
+# place, so sniffing doesn't slice (and allocate) the header per check.
+_Signature = tuple[int, bytes, int, bytes, str]
+
+_IMAGE_SIGNATURES: tuple[_Signature, ...] = (
+    (0, b"\x89PNG\r\n\x1a\n", 0, b"", "image/png"),
+    (0, b"\xff\xd8", 0, b"", "image/jpeg"),
+    (0, b"GIF87a", 0, b"", "image/gif"),
+    (0, b"GIF89a", 0, b"", "image/gif"),
+    (0, b"RIFF", 8, b"WEBP", "image/webp"),
+    (0, b"\x00\x00\x01\x00", 0, b"", "image/x-icon"),
+)
+
+_AUDIO_SIGNATURES: tuple[_Signature, ...] = (
+    (0, b"RIFF", 8, b"WAVE", "audio/wav"),
+    (0, b"ID3", 0, b"", "audio/mpeg"),
+    (0, b"\xff\xfb", 0, b"", "audio/mpeg"),
+    (0, b"fLaC", 0, b"", "audio/flac"),
+    (0, b"OggS", 0, b"", "audio/ogg"),
+)
+
+_VIDEO_SIGNATURES: tuple[_Signature, ...] = (
+    # MP4/MOV (ftyp box), anything but a QuickTime brand is treated as MP4
+    (4, b"ftyp", 8, b"qt  ", "video/quicktime"),
+    (4, b"ftyp", 8, b"MSNV", "video/quicktime"),
+    (4, b"ftyp", 0, b"", "video/mp4"),
+    (0, b"RIFF", 8, b"AVI ", "video/x-msvideo"),
+    (0, b"\x00\x00\x01\xba", 0, b"", "video/mpeg"),
+    (0, b"\x00\x00\x01\xb3", 0, b"", "video/mpeg"),
+)
+
+_EBML_MAGIC = b"\x1a\x45\xdf\xa3"
+
+
+def _match_signature(data: bytes, signatures: tuple[_Signature, ...]) -> str | None:
+    """Return the MIME type of the first signature matching data"""
+    for offset, signature, inner_offset, inner_signature, mime_type in signatures:
+        if data.startswith(signature, offset) and data.startswith(
+            inner_signature, inner_offset
+        ):
+            return mime_type
+    return None
+
 
 def detect_image_mime_type(data: bytes) -> str:
     """Detect MIME type from image header bytes"""
-    if data[:8] == b"\x89PNG\r\n\x1a\n":
-        return "image/png"
-    if data[:2] == b"\xff\xd8":
-        return "image/jpeg"
-    if data[:6] in (b"GIF87a", b"GIF89a"):
-        return "image/gif"
-    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
-        return "image/webp"
-    if data[:4] == b"\x00\x00\x01\x00":
-        return "image/x-icon"
-    return "application/octet-stream"
+    return _match_signature(data, _IMAGE_SIGNATURES) or "application/octet-stream"
 
 
 def detect_audio_mime_type(data: bytes) -> str:
     """Detect MIME type from audio header bytes"""
-    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
-        return "audio/wav"
-    if data[:3] == b"ID3" or data[:2] == b"\xff\xfb":
-        return "audio/mpeg"
-    if data[:4] == b"fLaC":
-        return "audio/flac"
-    if data[:4] == b"OggS":
-        return "audio/ogg"
-    return "audio/octet-stream"
+    return _match_signature(data, _AUDIO_SIGNATURES) or "audio/octet-stream"
 
 
 def detect_video_mime_type(data: bytes) -> str:
     """Detect MIME type from video header bytes"""
-    # Check for common video formats
-    if len(data) >= 12:
-        # MP4/MOV (ftyp box)
-        if data[4:8] == b"ftyp":
-            ftyp_brand = data[8:12]
-            if ftyp_brand in (b"isom", b"iso2", b"mp41", b"mp42", b"avc1"):
-                return "video/mp4"
-            if ftyp_brand in (b"qt  ", b"MSNV"):
-                return "video/quicktime"
-            return "video/mp4"  # Default for ftyp
-        # WebM/MKV (EBML header)
-        if data[:4] == b"\x1a\x45\xdf\xa3":
-            # Check for WebM doctype
-            if b"webm" in data[:64]:
-                return "video/webm"
-            return "video/x-matroska"
-    # AVI
-    if data[:4] == b"RIFF" and data[8:12] == b"AVI ":
-        return "video/x-msvideo"
-    # MPEG
-    if data[:4] == b"\x00\x00\x01\xba" or data[:4] == b"\x00\x00\x01\xb3":
-        return "video/mpeg"
-    return "video/octet-stream"
+    # WebM/MKV share the EBML header, the doctype tells them apart
+    if data.startswith(_EBML_MAGIC):
+        if data.find(b"webm", 0, 64) != -1:
+            return "video/webm"
+        return "video/x-matroska"
+    return _match_signature(data, _VIDEO_SIGNATURES) or "video/octet-stream"
 
 
 class ArchiveMigration:
@@ -98,122 +111,17 @@ class ArchiveMigration:
         Returns:
             Tuple of (migrated Notebook, AssetIndex)
         """
-        logger = logging.getLogger("Migration")
-        logger.info("Starting migration from %s to %s", legacy_filepath, new_filepath)
+        _LOGGER.info("Starting migration from %s to %s", legacy_filepath, new_filepath)
 
         # Load legacy notebook
         notebook = load_legacy_notebook(legacy_filepath, key_buffer, progress)
-        logger.debug("Loaded notebook with %d pages", len(notebook.pages))
+        _LOGGER.debug("Loaded notebook with %d pages", len(notebook.pages))
 
-        # Extract assets from all pages
-        assets = AssetIndex()
-        total_assets = 0
-
-        for page in notebook.pages:
-            for element in page.elements:
-                if isinstance(element, Image) and element.image_data:
-                    # Extract image data to asset
-                    mime_type = detect_image_mime_type(element.image_data)
-                    asset = Asset.create(
-                        AssetType.IMAGE,
-                        mime_type,
-                        element.image_data,
-                    )
-                    assets.add(asset)
-
-                    # Update element to reference asset
-                    element.asset_id = asset.asset_id
-                    element.image_data = None  # Clear inline data
-
-                    total_assets += 1
-                    logger.debug(
-                        "Extracted image asset: %s (%s)",
-                        asset.asset_id,
-                        mime_type,
-                    )
-
-                elif isinstance(element, VoiceMemo) and element.audio_data:
-                    # Extract audio data to asset
-                    mime_type = detect_audio_mime_type(element.audio_data)
-                    asset = Asset.create(
-                        AssetType.AUDIO,
-                        mime_type,
-                        element.audio_data,
-                    )
-                    assets.add(asset)
-
-                    # Update element to reference asset
-                    element.asset_id = asset.asset_id
-                    element.audio_data = None  # Clear inline data
-
-                    total_assets += 1
-                    logger.debug(
-                        "Extracted audio asset: %s (%s)",
-                        asset.asset_id,
-                        mime_type,
-                    )
-                elif isinstance(element, Video) and element.video_data:
-                    # Extract video data to asset
-                    mime_type = detect_video_mime_type(element.video_data)
-                    asset = Asset.create(
-                        AssetType.VIDEO,
-                        mime_type,
-                        element.video_data,
-                    )
-                    assets.add(asset)
-
-                    # Update element to reference asset
-                    element.asset_id = asset.asset_id
-                    element.video_data = None  # Clear inline data
-
-                    total_assets += 1
-                    logger.debug(
-                        "Extracted video asset: %s (%s)",
-                        asset.asset_id,
-                        mime_type,
-                    )
-
-                if isinstance(element, Video) and element.thumbnail_data:
-                    # Extract thumbnail to asset
-                    mime_type = detect_image_mime_type(element.thumbnail_data)
-                    asset = Asset.create(
-                        AssetType.IMAGE,
-                        mime_type,
-                        element.thumbnail_data,
-                    )
-                    assets.add(asset)
-
-                    element.thumbnail_asset_id = asset.asset_id
-                    element.thumbnail_data = None
-
-                    total_assets += 1
-                    logger.debug(
-                        "Extracted video thumbnail asset: %s (%s)",
-                        asset.asset_id,
-                        mime_type,
-                    )
-                elif isinstance(element, Video) and element.video_data:
-                    # Extract video data to asset
-                    mime_type = detect_video_mime_type(element.video_data)
-                    asset = Asset.create(
-                        AssetType.VIDEO,
-                        mime_type,
-                        element.video_data,
-                    )
-                    assets.add(asset)
-
-                    # Update element to reference asset
-                    element.asset_id = asset.asset_id
-                    element.video_data = None  # Clear inline data
-
-                    total_assets += 1
-                    logger.debug(
-                        "Extracted video asset: %s (%s)",
-                        asset.asset_id,
-                        mime_type,
-                    )
-
-        logger.info("Extracted %d assets from notebook", total_assets)
+        # Extract assets from all pages, the archive keeps them out of the pages
+        assets = ArchiveMigration.extract_assets_from_notebook(
+            notebook, clear_inline_data=True
+        )
+        _LOGGER.info("Extracted %d assets from notebook", len(assets))
 
         # Save in new archive format (single notebook archive)
         ArchiveDAO.save_all(
@@ -225,7 +133,7 @@ class ArchiveMigration:
             None,
             progress,
         )
-        logger.info("Migration completed successfully")
+        _LOGGER.info("Migration completed successfully")
 
         return notebook, assets
 
@@ -250,12 +158,11 @@ class ArchiveMigration:
         Returns:
             Tuple of (list of migrated Notebooks, asset index per notebook)
         """
-        logger = logging.getLogger("Migration")
-        logger.info("Starting multi-notebook migration")
+        _LOGGER.info("Starting multi-notebook migration")
 
         # Load legacy notebooks
         notebooks = load_legacy_notebooks(legacy_filepath, key_buffer, progress)
-        logger.debug("Loaded %d notebooks", len(notebooks))
+        _LOGGER.debug("Loaded %d notebooks", len(notebooks))
 
         if not notebooks:
             return [], {}
@@ -268,7 +175,7 @@ class ArchiveMigration:
             assets_by_notebook[notebook.notebook_id] = assets
             total_assets += len(assets)
 
-        logger.info("Extracted %d assets from notebooks", total_assets)
+        _LOGGER.info("Extracted %d assets from notebooks", total_assets)
 
         ArchiveDAO.save_all(
             notebooks,
@@ -279,7 +186,7 @@ class ArchiveMigration:
             None,
             progress,
         )
-        logger.info("Migration completed for all notebooks")
+        _LOGGER.info("Migration completed for all notebooks")
 
         return notebooks, assets_by_notebook
 
@@ -295,28 +202,18 @@ class ArchiveMigration:
             notebook: Notebook to update
             assets: Asset index with binary data
         """
+        get_injector = _INJECTORS.get
+
         for page in notebook.pages:
             for element in page.elements:
-                if isinstance(element, Image) and element.asset_id:
-                    asset = assets.get(element.asset_id)
-                    if asset and asset.data:
-                        element.image_data = asset.data
-
-                elif isinstance(element, VoiceMemo) and element.asset_id:
-                    asset = assets.get(element.asset_id)
-                    if asset and asset.data:
-                        element.audio_data = asset.data
-                elif isinstance(element, Video) and element.asset_id:
-                    asset = assets.get(element.asset_id)
-                    if asset and asset.data:
-                        element.video_data = asset.data
-                if isinstance(element, Video) and element.thumbnail_asset_id:
-                    asset = assets.get(element.thumbnail_asset_id)
-                    if asset and asset.data:
-                        element.thumbnail_data = asset.data
+                injector = get_injector(type(element))
+                if injector is not None:
+                    injector(element, assets)
 
     @staticmethod
-    def extract_assets_from_notebook(notebook: Notebook) -> AssetIndex:
+    def extract_assets_from_notebook(
+        notebook: Notebook, clear_inline_data: bool = False
+    ) -> AssetIndex:
         """
         Extract binary data from elements into an AssetIndex.
 
@@ -325,91 +222,177 @@ class ArchiveMigration:
 
         Args:
             notebook: Notebook to extract assets from
+            clear_inline_data: Drop the inline data once it is in an asset
 
         Returns:
             AssetIndex containing all extracted assets
         """
         assets = AssetIndex()
+        get_extractor = _EXTRACTORS.get
 
         for page in notebook.pages:
             for element in page.elements:
-                if isinstance(element, Image):
-                    if element.image_data and not element.asset_id:
-                        # Has inline data but no asset_id - create new asset
-                        mime_type = detect_image_mime_type(element.image_data)
-                        asset = Asset.create(
-                            AssetType.IMAGE,
-                            mime_type,
-                            element.image_data,
-                        )
-                        assets.add(asset)
-                        element.asset_id = asset.asset_id
-                    elif element.asset_id and element.image_data:
-                        # Has both - preserve existing asset with current data
-                        mime_type = detect_image_mime_type(element.image_data)
-                        asset = Asset(
-                            asset_id=element.asset_id,
-                            asset_type=AssetType.IMAGE,
-                            mime_type=mime_type,
-                            data=element.image_data,
-                        )
-                        assets.add(asset)
-
-                elif isinstance(element, VoiceMemo):
-                    if element.audio_data and not element.asset_id:
-                        mime_type = detect_audio_mime_type(element.audio_data)
-                        asset = Asset.create(
-                            AssetType.AUDIO,
-                            mime_type,
-                            element.audio_data,
-                        )
-                        assets.add(asset)
-                        element.asset_id = asset.asset_id
-                    elif element.asset_id and element.audio_data:
-                        mime_type = detect_audio_mime_type(element.audio_data)
-                        asset = Asset(
-                            asset_id=element.asset_id,
-                            asset_type=AssetType.AUDIO,
-                            mime_type=mime_type,
-                            data=element.audio_data,
-                        )
-                        assets.add(asset)
-                elif isinstance(element, Video):
-                    if element.video_data and not element.asset_id:
-                        mime_type = detect_video_mime_type(element.video_data)
-                        asset = Asset.create(
-                            AssetType.VIDEO,
-                            mime_type,
-                            element.video_data,
-                        )
-                        assets.add(asset)
-                        element.asset_id = asset.asset_id
-                    elif element.asset_id and element.video_data:
-                        mime_type = detect_video_mime_type(element.video_data)
-                        asset = Asset(
-                            asset_id=element.asset_id,
-                            asset_type=AssetType.VIDEO,
-                            mime_type=mime_type,
-                            data=element.video_data,
-                        )
-                        assets.add(asset)
-                    if element.thumbnail_data and not element.thumbnail_asset_id:
-                        mime_type = detect_image_mime_type(element.thumbnail_data)
-                        asset = Asset.create(
-                            AssetType.IMAGE,
-                            mime_type,
-                            element.thumbnail_data,
-                        )
-                        assets.add(asset)
-                        element.thumbnail_asset_id = asset.asset_id
-                    elif element.thumbnail_asset_id and element.thumbnail_data:
-                        mime_type = detect_image_mime_type(element.thumbnail_data)
-                        asset = Asset(
-                            asset_id=element.thumbnail_asset_id,
-                            asset_type=AssetType.IMAGE,
-                            mime_type=mime_type,
-                            data=element.thumbnail_data,
-                        )
-                        assets.add(asset)
+                extractor = get_extractor(type(element))
+                if extractor is not None:
+                    extractor(element, assets, clear_inline_data)
 
         return assets
+
+
+def _store_asset(
+    assets: AssetIndex,
+    asset_id: str | None,
+    asset_type: AssetType,
+    mime_type: str,
+    data: bytes,
+    checksum: str,
+) -> str:
+    """Add data to assets, keeping the element's asset_id if it has one"""
+    if asset_id:
+        asset = Asset(
+            asset_id=asset_id,
+            asset_type=asset_type,
+            mime_type=mime_type,
+            data=data,
+            checksum=checksum,
+        )
+    else:
+        asset = Asset.create(asset_type, mime_type, data, checksum=checksum)
+    assets.add(asset)
+    return asset.asset_id
+
+
+def _checksum(cache: tuple[bytes, str] | None, data: bytes) -> tuple[bytes, str]:
+    """Hash data, unless cache was computed from this very bytes object"""
+    # Saves extract every asset again, but the blobs are rarely replaced, so
+    # this skips re-hashing every image and video on each auto-save
+    if cache is not None and cache[0] is data:
+        return cache
+    return data, Asset.calculate_checksum(data)
+
+
+def _extract_image(element: PageElement, assets: AssetIndex, clear: bool) -> None:
+    image = cast(Image, element)
+    if image.image_data:
+        image.mime_type = image.mime_type or detect_image_mime_type(image.image_data)
+        image.data_checksum = _checksum(image.data_checksum, image.image_data)
+        image.asset_id = _store_asset(
+            assets,
+            image.asset_id,
+            AssetType.IMAGE,
+            image.mime_type,
+            image.image_data,
+            image.data_checksum[1],
+        )
+        if clear:
+            image.image_data = None
+            image.data_checksum = None
+
+
+def _extract_voice_memo(element: PageElement, assets: AssetIndex, clear: bool) -> None:
+    memo = cast(VoiceMemo, element)
+    if memo.audio_data:
+        memo.mime_type = memo.mime_type or detect_audio_mime_type(memo.audio_data)
+        memo.data_checksum = _checksum(memo.data_checksum, memo.audio_data)
+        memo.asset_id = _store_asset(
+            assets,
+            memo.asset_id,
+            AssetType.AUDIO,
+            memo.mime_type,
+            memo.audio_data,
+            memo.data_checksum[1],
+        )
+        if clear:
+            memo.audio_data = None
+            memo.data_checksum = None
+
+
+def _extract_video(element: PageElement, assets: AssetIndex, clear: bool) -> None:
+    video = cast(Video, element)
+    if video.video_data:
+        video.mime_type = video.mime_type or detect_video_mime_type(video.video_data)
+        video.data_checksum = _checksum(video.data_checksum, video.video_data)
+        video.asset_id = _store_asset(
+            assets,
+            video.asset_id,
+            AssetType.VIDEO,
+            video.mime_type,
+            video.video_data,
+            video.data_checksum[1],
+        )
+        if clear:
+            video.video_data = None
+            video.data_checksum = None
+    if video.thumbnail_data:
+        video.thumbnail_mime_type = video.thumbnail_mime_type or detect_image_mime_type(
+            video.thumbnail_data
+        )
+        video.thumbnail_checksum = _checksum(
+            video.thumbnail_checksum, video.thumbnail_data
+        )
+        video.thumbnail_asset_id = _store_asset(
+            assets,
+            video.thumbnail_asset_id,
+            AssetType.IMAGE,
+            video.thumbnail_mime_type,
+            video.thumbnail_data,
+            video.thumbnail_checksum[1],
+        )
+        if clear:
+            video.thumbnail_data = None
+            video.thumbnail_checksum = None
+
+
+# Looked up by exact type, so each element costs one dict lookup
+_EXTRACTORS: dict[
+    type[PageElement], Callable[[PageElement, AssetIndex, bool], None]
+] = {
+    Image: _extract_image,
+    VoiceMemo: _extract_voice_memo,
+    Video: _extract_video,
+}
+
+
+def _inject_image(element: PageElement, assets: AssetIndex) -> None:
+    image = cast(Image, element)
+    asset = assets.get(image.asset_id) if image.asset_id else None
+    if asset and asset.data:
+        image.image_data = asset.data
+        image.mime_type = asset.mime_type
+        if asset.checksum:
+            image.data_checksum = (asset.data, asset.checksum)
+
+
+def _inject_voice_memo(element: PageElement, assets: AssetIndex) -> None:
+    memo = cast(VoiceMemo, element)
+    asset = assets.get(memo.asset_id) if memo.asset_id else None
+    if asset and asset.data:
+        memo.audio_data = asset.data
+        memo.mime_type = asset.mime_type
+        if asset.checksum:
+            memo.data_checksum = (asset.data, asset.checksum)
+
+
+def _inject_video(element: PageElement, assets: AssetIndex) -> None:
+    video = cast(Video, element)
+    asset = assets.get(video.asset_id) if video.asset_id else None
+    if asset and asset.data:
+        video.video_data = asset.data
+        video.mime_type = asset.mime_type
+        if asset.checksum:
+            video.data_checksum = (asset.data, asset.checksum)
+    thumbnail = (
+        assets.get(video.thumbnail_asset_id) if video.thumbnail_asset_id else None
+    )
+    if thumbnail and thumbnail.data:
+        video.thumbnail_data = thumbnail.data
+        video.thumbnail_mime_type = thumbnail.mime_type
+        if thumbnail.checksum:
+            video.thumbnail_checksum = (thumbnail.data, thumbnail.checksum)
+
+
+_INJECTORS: dict[type[PageElement], Callable[[PageElement, AssetIndex], None]] = {
+    Image: _inject_image,
+    VoiceMemo: _inject_voice_memo,
+    Video: _inject_video,
+}
@@ -2,18 +2,39 @@
 
 import logging
 from base64 import b64decode, b64encode
-from dataclasses import dataclass
 from typing import Any, cast, override
 
 from diary.config import settings
 from diary.models.page_element import PageElement
 from diary.models.point import Point
 
+# Resolve the serialization keys once, not per element through the Enum
+_KEY_TYPE: str = settings.SERIALIZATION_KEYS.ELEMENT_TYPE.value
+_KEY_ID: str = settings.SERIALIZATION_KEYS.ELEMENT_ID.value
+_KEY_POSITION: str = settings.SERIALIZATION_KEYS.POSITION.value
+_KEY_WIDTH: str = settings.SERIALIZATION_KEYS.WIDTH.value
+_KEY_HEIGHT: str = settings.SERIALIZATION_KEYS.HEIGHT.value
+_KEY_PATH: str = settings.SERIALIZATION_KEYS.PATH.value
+_KEY_ROTATION: str = settings.SERIALIZATION_KEYS.ROTATION.value
+_KEY_ASSET_ID: str = settings.SERIALIZATION_KEYS.ASSET_ID.value
+_KEY_DATA: str = settings.SERIALIZATION_KEYS.DATA.value
+
 
-@dataclass
 class Image(PageElement):
     """Represents an Image element on a page"""
 
+    __slots__ = (
+        "position",
+        "width",
+        "height",
+        "image_path",
+        "image_data",
+        "rotation",
+        "asset_id",
+        "mime_type",
+        "data_checksum",
+    )
+
     def __init__(
         self,
         position: Point,
@@ -24,6 +45,7 @@ class Image(PageElement):
         rotation: float = 0.0,
         element_id: str | None = None,
         asset_id: str | None = None,
+        mime_type: str | None = None,
     ):
         super().__init__("image", element_id)
         self.position: Point = position
@@ -33,29 +55,36 @@ class Image(PageElement):
         self.image_data: bytes | None = image_data
         self.rotation: float = rotation
         self.asset_id: str | None = asset_id
+        # Known from where the data came from, or detected once when it is first
+        # stored as an asset. Not serialized
+        self.mime_type: str | None = mime_type
+        # (data, checksum) from the last time the data was stored as an asset,
+        # reused while the element still holds that same bytes object. Not
+        # serialized
+        self.data_checksum: tuple[bytes, str] | None = None
 
     @override
     def to_dict(self) -> dict[str, Any]:
         """Serialize this image to a dictionary for JSON storage"""
         result: dict[str, Any] = {
-            settings.SERIALIZATION_KEYS.ELEMENT_TYPE.value: self.element_type,
-            settings.SERIALIZATION_KEYS.ELEMENT_ID.value: self.element_id,
-            settings.SERIALIZATION_KEYS.POSITION.value: [
+            _KEY_TYPE: self.element_type,
+            _KEY_ID: self.element_id,
+            _KEY_POSITION: [
                 self.position.x,
                 self.position.y,
                 self.position.pressure,
             ],
-            settings.SERIALIZATION_KEYS.WIDTH.value: self.width,
-            settings.SERIALIZATION_KEYS.HEIGHT.value: self.height,
-            settings.SERIALIZATION_KEYS.PATH.value: self.image_path,
-            settings.SERIALIZATION_KEYS.ROTATION.value: self.rotation,
+            _KEY_WIDTH: self.width,
+            _KEY_HEIGHT: self.height,
+            _KEY_PATH: self.image_path,
+            _KEY_ROTATION: self.rotation,
         }
 
         # Use asset_id if available, otherwise fall back to inline data
         if self.asset_id:
-            result[settings.SERIALIZATION_KEYS.ASSET_ID.value] = self.asset_id
+            result[_KEY_ASSET_ID] = self.asset_id
         elif self.image_data:
-            result[settings.SERIALIZATION_KEYS.DATA.value] = b64encode(self.image_data)
+            result[_KEY_DATA] = b64encode(self.image_data)
 
         return result
 
@@ -63,9 +92,7 @@ class Image(PageElement):
     @override
     def from_dict(cls, data: dict[str, Any]) -> "Image":
         """Deserialize this image from a dictionary loaded from JSON"""
-        position_data: list[float] = data.get(
-            settings.SERIALIZATION_KEYS.POSITION.value, []
-        )
+        position_data: list[float] = data.get(_KEY_POSITION, [])
         position = Point(
             x=position_data[0],
             y=position_data[1],
@@ -73,34 +100,32 @@ class Image(PageElement):
         )
 
         # Check for asset_id first (new format), then fall back to inline data
-        asset_id = data.get(settings.SERIALIZATION_KEYS.ASSET_ID.value)
+        asset_id = data.get(_KEY_ASSET_ID)
         image_data = None
-        if not asset_id and data.get(settings.SERIALIZATION_KEYS.DATA.value):
+        if not asset_id and data.get(_KEY_DATA):
             try:
-                image_data = b64decode(data[settings.SERIALIZATION_KEYS.DATA.value])
+                image_data = b64decode(data[_KEY_DATA])
             except (ValueError, TypeError) as e:
                 logging.getLogger("Image").error(e)
                 image_data = None
 
         return cls(
             position=position,
-            width=cast(float, data.get(settings.SERIALIZATION_KEYS.WIDTH.value, 100.0)),
-            height=cast(
-                float, data.get(settings.SERIALIZATION_KEYS.HEIGHT.value, 100.0)
-            ),
-            image_path=data.get(settings.SERIALIZATION_KEYS.PATH.value),
+            width=cast(float, data.get(_KEY_WIDTH, 100.0)),
+            height=cast(float, data.get(_KEY_HEIGHT, 100.0)),
+            image_path=data.get(_KEY_PATH),
             image_data=image_data,
-            rotation=cast(
-                float, data.get(settings.SERIALIZATION_KEYS.ROTATION.value, 0.0)
-            ),
-            element_id=data.get(settings.SERIALIZATION_KEYS.ELEMENT_ID.value),
+            rotation=cast(float, data.get(_KEY_ROTATION, 0.0)),
+            element_id=data.get(_KEY_ID),
             asset_id=asset_id,
         )
 
     @override
     def __eq__(self, other: object, /) -> bool:
-        if not other or not isinstance(other, Image):
-            return False
+        if self is other:
+            return True
+        if not isinstance(other, Image):
+            return NotImplemented
 
         # Use fast UUID check from parent class
         parent_result = super().__eq__(other)
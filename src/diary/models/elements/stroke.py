@@ -1,17 +1,57 @@
 """Represents a continuous Stroke of ink in the Page"""
 
-from dataclasses import dataclass
+import math
+import operator
+import sys
+from array import array
 from typing import Any, cast, override
 
 from diary.config import settings
 from diary.models.page_element import PageElement
 from diary.models.point import Point
 
+# Resolve the serialization keys once, not per stroke through the Enum
+_KEY_TYPE: str = settings.SERIALIZATION_KEYS.ELEMENT_TYPE.value
+_KEY_ID: str = settings.SERIALIZATION_KEYS.ELEMENT_ID.value
+_KEY_POINTS: str = settings.SERIALIZATION_KEYS.POINTS.value
+_KEY_COLOR: str = settings.SERIALIZATION_KEYS.COLOR.value
+_KEY_THICKNESS: str = settings.SERIALIZATION_KEYS.THICKNESS.value
+_KEY_TOOL: str = settings.SERIALIZATION_KEYS.TOOL.value
+_KEY_ROTATION: str = settings.SERIALIZATION_KEYS.ROTATION.value
+
+# Packed points are little-endian int16 triplets of x, y and pressure in tenths,
+# the same 0.1 precision the list form is rounded to. That covers ±3276.7, far
+# beyond the page size; strokes reaching past it keep the list form
+_POINT_SCALE = 10
+_PACKED_MIN = -(2**15)
+_PACKED_MAX = 2**15 - 1
+_SWAP_BYTES = sys.byteorder == "big"
+
+
+class _SamePoints:
+    """Copy of a list of points, equal to another holding the very same points"""
+
+    # Comparing the points by value costs about as much as packing them. They
+    # are replaced rather than edited in place, so identity will do
+    __slots__ = ("points",)
+
+    def __init__(self, points: list[Point]):
+        self.points: list[Point] = points.copy()
+
+    @override
+    def __eq__(self, other: object, /) -> bool:
+        if not isinstance(other, _SamePoints):
+            return NotImplemented
+        return len(self.points) == len(other.points) and all(
+            map(operator.is_, self.points, other.points)
+        )
+
 
-@dataclass
 class Stroke(PageElement):
     """Represents a continuous Stroke of ink in the Page"""
 
+    __slots__ = ("points", "color", "thickness", "tool", "rotation")
+
     def __init__(
         self,
         points: list[Point] | None = None,
@@ -31,46 +71,109 @@ class Stroke(PageElement):
     @override
     def to_dict(self) -> dict[str, Any]:
         """Serialize this stroke to a dictionary for JSON storage"""
+        result = self._to_dict_without_points()
+        # Round coordinates inline rather than going through Point.to_dict(),
+        # as floats like it does even when a coordinate is an int
+        result[_KEY_POINTS] = [
+            [float(round(p.x, 1)), float(round(p.y, 1)), float(round(p.pressure, 1))]
+            for p in self.points
+        ]
+        return result
+
+    @override
+    def to_packed_dict(self) -> dict[str, Any]:
+        """Serialize this stroke with its points packed into bytes"""
+        scaled = [
+            value * _POINT_SCALE
+            for p in self.points
+            for value in (p.x, p.y, p.pressure)
+        ]
+        # round() raises on NaN and inf, which the list form still writes. Any
+        # of them makes the sum non-finite, and summing is cheaper than a check
+        # per value; a sum overflowing to inf is out of range anyway
+        if not math.isfinite(sum(scaled)):
+            return self.to_dict()
+        values = [round(value) for value in scaled]
+        if values and (min(values) < _PACKED_MIN or max(values) > _PACKED_MAX):
+            return self.to_dict()
+
+        result = self._to_dict_without_points()
+        packed = array("h", values)
+        if _SWAP_BYTES:
+            packed.byteswap()
+        result[_KEY_POINTS] = packed.tobytes()
+        return result
+
+    @override
+    def snapshot(self) -> object:
+        """Snapshot of the stroke, comparing its points by identity"""
+        return (self._to_dict_without_points(), _SamePoints(self.points))
+
+    def _to_dict_without_points(self) -> dict[str, Any]:
+        """Serialize everything but the points"""
         return {
-            settings.SERIALIZATION_KEYS.ELEMENT_TYPE.value: self.element_type,
-            settings.SERIALIZATION_KEYS.ELEMENT_ID.value: self.element_id,
-            settings.SERIALIZATION_KEYS.POINTS.value: [
-                p.to_dict() for p in self.points
-            ],
-            settings.SERIALIZATION_KEYS.COLOR.value: self.color,
-            settings.SERIALIZATION_KEYS.THICKNESS.value: float(f"{self.thickness:.1f}"),
-            settings.SERIALIZATION_KEYS.TOOL.value: self.tool,
-            settings.SERIALIZATION_KEYS.ROTATION.value: self.rotation,
+            _KEY_TYPE: self.element_type,
+            _KEY_ID: self.element_id,
+            _KEY_COLOR: self.color,
+            _KEY_THICKNESS: float(f"{self.thickness:.1f}"),
+            _KEY_TOOL: self.tool,
+            _KEY_ROTATION: self.rotation,
         }
 
-    @classmethod
-    @override
-    def from_dict(cls, data: dict[str, Any]) -> "Stroke":
-        """Deserialize this stroke from a dictionary loaded from JSON"""
+    @staticmethod
+    def _unpack_points(packed: bytes) -> list[Point]:
+        """Rebuild the points written by to_packed_dict()"""
+        values = array("h")
+        values.frombytes(packed)
+        if _SWAP_BYTES:
+            values.byteswap()
+        scaled = iter([value / _POINT_SCALE for value in values])
+        return [Point(x, y, pressure) for x, y, pressure in zip(scaled, scaled, scaled)]
+
+    @staticmethod
+    def _parse_points(raw_points: list[Any]) -> list[Point]:
+        """Parse a list of points one by one, skipping the malformed ones"""
         points: list[Point] = []
-        if settings.SERIALIZATION_KEYS.POINTS.value in data and isinstance(
-            data[settings.SERIALIZATION_KEYS.POINTS.value], list
-        ):
-            for point_data in data[settings.SERIALIZATION_KEYS.POINTS.value]:
-                if isinstance(point_data, (tuple, list)):
-                    point = Point(
+        for point_data in raw_points:
+            if isinstance(point_data, (tuple, list)) and len(point_data) >= 3:
+                points.append(
+                    Point(
                         x=float(point_data[0]),
                         y=float(point_data[1]),
                         pressure=float(point_data[2]),
                     )
-                    points.append(point)
+                )
+        return points
+
+    @classmethod
+    @override
+    def from_dict(cls, data: dict[str, Any]) -> "Stroke":
+        """Deserialize this stroke from a dictionary loaded from JSON"""
+        points: list[Point] = []
+        raw_points = data.get(_KEY_POINTS)
+        if isinstance(raw_points, bytes):
+            points = cls._unpack_points(raw_points)
+        elif isinstance(raw_points, list):
+            # Points are always written as [x, y, pressure] by to_dict(), so unpack
+            # them directly, without per-value float() coercion or type checks
+            try:
+                points = [Point(x, y, pressure) for x, y, pressure in raw_points]
+            except (TypeError, ValueError):
+                points = cls._parse_points(cast(list[Any], raw_points))
 
         return cls(
             points=points,
-            color=cast(str, data.get(settings.SERIALIZATION_KEYS.COLOR.value, "black")),
-            size=float(data.get(settings.SERIALIZATION_KEYS.THICKNESS.value, 1.0)),
-            tool=cast(str, data.get(settings.SERIALIZATION_KEYS.TOOL.value, "pen")),
-            rotation=float(data.get(settings.SERIALIZATION_KEYS.ROTATION.value, 0.0)),
-            element_id=data.get(settings.SERIALIZATION_KEYS.ELEMENT_ID.value),
+            color=cast(str, data.get(_KEY_COLOR, "black")),
+            size=float(data.get(_KEY_THICKNESS, 1.0)),
+            tool=cast(str, data.get(_KEY_TOOL, "pen")),
+            rotation=float(data.get(_KEY_ROTATION, 0.0)),
+            element_id=data.get(_KEY_ID),
         )
 
     @override
     def __eq__(self, other: object, /) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Stroke):
             return NotImplemented
 
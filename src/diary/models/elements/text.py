@@ -1,17 +1,26 @@
 """A string of text in the page"""
 
-from dataclasses import dataclass
 from typing import Any, cast, override
 
 from diary.config import settings
 from diary.models.page_element import PageElement
 from diary.models.point import Point
 
+# Resolve the serialization keys once, not per element through the Enum
+_KEY_TYPE: str = settings.SERIALIZATION_KEYS.ELEMENT_TYPE.value
+_KEY_ID: str = settings.SERIALIZATION_KEYS.ELEMENT_ID.value
+_KEY_POSITION: str = settings.SERIALIZATION_KEYS.POSITION.value
+_KEY_COLOR: str = settings.SERIALIZATION_KEYS.COLOR.value
+_KEY_TEXT: str = settings.SERIALIZATION_KEYS.TEXT.value
+_KEY_SIZE_PX: str = settings.SERIALIZATION_KEYS.SIZE_PX.value
+_KEY_ROTATION: str = settings.SERIALIZATION_KEYS.ROTATION.value
+
 
-@dataclass
 class Text(PageElement):
     """Represents a string of text in the page"""
 
+    __slots__ = ("text", "position", "color", "size_px", "rotation")
+
     def __init__(
         self,
         text: str,
@@ -32,38 +41,38 @@ class Text(PageElement):
     def to_dict(self) -> dict[str, Any]:
         """Serialize this text to a dictionary for JSON storage"""
         return {
-            settings.SERIALIZATION_KEYS.ELEMENT_TYPE.value: self.element_type,
-            settings.SERIALIZATION_KEYS.ELEMENT_ID.value: self.element_id,
-            settings.SERIALIZATION_KEYS.POSITION.value: [
+            _KEY_TYPE: self.element_type,
+            _KEY_ID: self.element_id,
+            _KEY_POSITION: [
                 self.position.x,
                 self.position.y,
             ],
-            settings.SERIALIZATION_KEYS.COLOR.value: self.color,
-            settings.SERIALIZATION_KEYS.TEXT.value: self.text,
-            settings.SERIALIZATION_KEYS.SIZE_PX.value: self.size_px,
-            settings.SERIALIZATION_KEYS.ROTATION.value: self.rotation,
+            _KEY_COLOR: self.color,
+            _KEY_TEXT: self.text,
+            _KEY_SIZE_PX: self.size_px,
+            _KEY_ROTATION: self.rotation,
         }
 
     @classmethod
     @override
     def from_dict(cls, data: dict[str, Any]) -> "Text":
         """Deserialize this stroke from a dictionary loaded from JSON"""
-        position = cast(
-            list[float], data.get(settings.SERIALIZATION_KEYS.POSITION.value)
-        )
+        position = cast(list[float], data.get(_KEY_POSITION))
         return cls(
-            element_id=data.get(settings.SERIALIZATION_KEYS.ELEMENT_ID.value),
-            text=cast(str, data.get(settings.SERIALIZATION_KEYS.TEXT.value, "")),
+            element_id=data.get(_KEY_ID),
+            text=cast(str, data.get(_KEY_TEXT, "")),
             position=Point(position[0], position[1]),
-            color=cast(str, data.get(settings.SERIALIZATION_KEYS.COLOR.value, "black")),
-            size_px=float(data.get(settings.SERIALIZATION_KEYS.SIZE_PX.value, 20.0)),
-            rotation=float(data.get(settings.SERIALIZATION_KEYS.ROTATION.value, 0.0)),
+            color=cast(str, data.get(_KEY_COLOR, "black")),
+            size_px=float(data.get(_KEY_SIZE_PX, 20.0)),
+            rotation=float(data.get(_KEY_ROTATION, 0.0)),
         )
 
     @override
     def __eq__(self, other: object, /) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Text):
-            return False
+            return NotImplemented
 
         parent_result = super().__eq__(other)  # Check for ID
         if parent_result is not NotImplemented:
@@ -1,18 +1,43 @@
 """Represents a Video element that can be placed on a page"""
 
 from base64 import b64decode, b64encode
-from dataclasses import dataclass
 from typing import Any, cast, override
 
 from diary.config import settings
 from diary.models.page_element import PageElement
 from diary.models.point import Point
 
+# Resolve the serialization keys once, not per element through the Enum
+_KEY_TYPE: str = settings.SERIALIZATION_KEYS.ELEMENT_TYPE.value
+_KEY_ID: str = settings.SERIALIZATION_KEYS.ELEMENT_ID.value
+_KEY_POSITION: str = settings.SERIALIZATION_KEYS.POSITION.value
+_KEY_WIDTH: str = settings.SERIALIZATION_KEYS.WIDTH.value
+_KEY_HEIGHT: str = settings.SERIALIZATION_KEYS.HEIGHT.value
+_KEY_ROTATION: str = settings.SERIALIZATION_KEYS.ROTATION.value
+_KEY_DURATION: str = settings.SERIALIZATION_KEYS.DURATION.value
+_KEY_ASSET_ID: str = settings.SERIALIZATION_KEYS.ASSET_ID.value
+_KEY_DATA: str = settings.SERIALIZATION_KEYS.DATA.value
+
 
-@dataclass
 class Video(PageElement):
     """Represents a Video element on a page"""
 
+    __slots__ = (
+        "position",
+        "width",
+        "height",
+        "asset_id",
+        "video_data",
+        "rotation",
+        "duration",
+        "thumbnail_data",
+        "thumbnail_asset_id",
+        "mime_type",
+        "thumbnail_mime_type",
+        "data_checksum",
+        "thumbnail_checksum",
+    )
+
     def __init__(
         self,
         position: Point,
@@ -25,6 +50,8 @@ class Video(PageElement):
         thumbnail_data: bytes | None = None,
         thumbnail_asset_id: str | None = None,
         element_id: str | None = None,
+        mime_type: str | None = None,
+        thumbnail_mime_type: str | None = None,
     ):
         super().__init__("video", element_id)
         self.position: Point = position
@@ -36,28 +63,37 @@ class Video(PageElement):
         self.duration: float = duration  # Duration in seconds
         self.thumbnail_data: bytes | None = thumbnail_data
         self.thumbnail_asset_id: str | None = thumbnail_asset_id
+        # Known from where the data came from, or detected once when it is first
+        # stored as an asset. Not serialized
+        self.mime_type: str | None = mime_type
+        self.thumbnail_mime_type: str | None = thumbnail_mime_type
+        # (data, checksum) from the last time the data was stored as an asset,
+        # reused while the element still holds that same bytes object. Not
+        # serialized
+        self.data_checksum: tuple[bytes, str] | None = None
+        self.thumbnail_checksum: tuple[bytes, str] | None = None
 
     @override
     def to_dict(self) -> dict[str, Any]:
         """Serialize this video to a dictionary for storage"""
         result: dict[str, Any] = {
-            settings.SERIALIZATION_KEYS.ELEMENT_TYPE.value: self.element_type,
-            settings.SERIALIZATION_KEYS.ELEMENT_ID.value: self.element_id,
-            settings.SERIALIZATION_KEYS.POSITION.value: [
+            _KEY_TYPE: self.element_type,
+            _KEY_ID: self.element_id,
+            _KEY_POSITION: [
                 self.position.x,
                 self.position.y,
                 self.position.pressure,
             ],
-            settings.SERIALIZATION_KEYS.WIDTH.value: self.width,
-            settings.SERIALIZATION_KEYS.HEIGHT.value: self.height,
-            settings.SERIALIZATION_KEYS.ROTATION.value: self.rotation,
-            settings.SERIALIZATION_KEYS.DURATION.value: self.duration,
+            _KEY_WIDTH: self.width,
+            _KEY_HEIGHT: self.height,
+            _KEY_ROTATION: self.rotation,
+            _KEY_DURATION: self.duration,
         }
 
         if self.asset_id:
-            result[settings.SERIALIZATION_KEYS.ASSET_ID.value] = self.asset_id
+            result[_KEY_ASSET_ID] = self.asset_id
         elif self.video_data:
-            result[settings.SERIALIZATION_KEYS.DATA.value] = b64encode(self.video_data)
+            result[_KEY_DATA] = b64encode(self.video_data)
 
         if self.thumbnail_asset_id:
             result["thumb"] = self.thumbnail_asset_id
@@ -70,20 +106,18 @@ class Video(PageElement):
     @override
     def from_dict(cls, data: dict[str, Any]) -> "Video":
         """Deserialize this video from a dictionary"""
-        position_data: list[float] = data.get(
-            settings.SERIALIZATION_KEYS.POSITION.value, [0, 0, 1]
-        )
+        position_data: list[float] = data.get(_KEY_POSITION, [0, 0, 1])
         position = Point(
             x=position_data[0],
             y=position_data[1],
             pressure=position_data[2] if len(position_data) > 2 else 1.0,
         )
 
-        asset_id = data.get(settings.SERIALIZATION_KEYS.ASSET_ID.value)
+        asset_id = data.get(_KEY_ASSET_ID)
         video_data = None
-        if not asset_id and data.get(settings.SERIALIZATION_KEYS.DATA.value):
+        if not asset_id and data.get(_KEY_DATA):
             try:
-                video_data = b64decode(data[settings.SERIALIZATION_KEYS.DATA.value])
+                video_data = b64decode(data[_KEY_DATA])
             except (ValueError, TypeError):
                 video_data = None
 
@@ -96,28 +130,24 @@ class Video(PageElement):
 
         video = cls(
             position=position,
-            width=cast(float, data.get(settings.SERIALIZATION_KEYS.WIDTH.value, 320.0)),
-            height=cast(
-                float, data.get(settings.SERIALIZATION_KEYS.HEIGHT.value, 240.0)
-            ),
+            width=cast(float, data.get(_KEY_WIDTH, 320.0)),
+            height=cast(float, data.get(_KEY_HEIGHT, 240.0)),
             asset_id=asset_id,
-            rotation=cast(
-                float, data.get(settings.SERIALIZATION_KEYS.ROTATION.value, 0.0)
-            ),
-            duration=cast(
-                float, data.get(settings.SERIALIZATION_KEYS.DURATION.value, 0.0)
-            ),
+            rotation=cast(float, data.get(_KEY_ROTATION, 0.0)),
+            duration=cast(float, data.get(_KEY_DURATION, 0.0)),
             thumbnail_data=thumbnail_data,
             thumbnail_asset_id=data.get("thumb"),
-            element_id=data.get(settings.SERIALIZATION_KEYS.ELEMENT_ID.value),
+            element_id=data.get(_KEY_ID),
         )
         video.video_data = video_data
         return video
 
     @override
     def __eq__(self, other: object, /) -> bool:
-        if not other or not isinstance(other, Video):
-            return False
+        if self is other:
+            return True
+        if not isinstance(other, Video):
+            return NotImplemented
 
         # Use fast UUID check from parent class
         parent_result = super().__eq__(other)
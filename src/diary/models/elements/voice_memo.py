@@ -1,17 +1,42 @@
 """Represents a VoiceMemo element that can be placed on a page"""
 
-from dataclasses import dataclass
 from typing import Any, cast, override
 
 from diary.config import settings
 from diary.models.page_element import PageElement
 from diary.models.point import Point
 
+# Resolve the serialization keys once, not per element through the Enum
+_KEY_TYPE: str = settings.SERIALIZATION_KEYS.ELEMENT_TYPE.value
+_KEY_ID: str = settings.SERIALIZATION_KEYS.ELEMENT_ID.value
+_KEY_POSITION: str = settings.SERIALIZATION_KEYS.POSITION.value
+_KEY_DURATION: str = settings.SERIALIZATION_KEYS.DURATION.value
+_KEY_PATH: str = settings.SERIALIZATION_KEYS.PATH.value
+_KEY_TRANSCRIPT: str = settings.SERIALIZATION_KEYS.TRANSCRIPT.value
+_KEY_CREATED_AT: str = settings.SERIALIZATION_KEYS.CREATED_AT.value
+_KEY_WIDTH: str = settings.SERIALIZATION_KEYS.WIDTH.value
+_KEY_HEIGHT: str = settings.SERIALIZATION_KEYS.HEIGHT.value
+_KEY_ASSET_ID: str = settings.SERIALIZATION_KEYS.ASSET_ID.value
+_KEY_DATA: str = settings.SERIALIZATION_KEYS.DATA.value
+
 
-@dataclass
 class VoiceMemo(PageElement):
     """Represents a Voice Memo element on a page"""
 
+    __slots__ = (
+        "position",
+        "duration",
+        "audio_path",
+        "audio_data",
+        "transcript",
+        "created_at",
+        "width",
+        "height",
+        "asset_id",
+        "mime_type",
+        "data_checksum",
+    )
+
     def __init__(
         self,
         position: Point,
@@ -24,6 +49,7 @@ class VoiceMemo(PageElement):
         height: float = 50.0,
         element_id: str | None = None,
         asset_id: str | None = None,
+        mime_type: str | None = None,
     ):
         super().__init__("voice_memo", element_id)
         self.position: Point = position
@@ -35,31 +61,38 @@ class VoiceMemo(PageElement):
         self.width: float = width  # Visual representation size
         self.height: float = height
         self.asset_id: str | None = asset_id
+        # Known from where the data came from, or detected once when it is first
+        # stored as an asset. Not serialized
+        self.mime_type: str | None = mime_type
+        # (data, checksum) from the last time the data was stored as an asset,
+        # reused while the element still holds that same bytes object. Not
+        # serialized
+        self.data_checksum: tuple[bytes, str] | None = None
 
     @override
     def to_dict(self) -> dict[str, Any]:
         """Serialize this voice memo to a dictionary for JSON storage"""
         result: dict[str, Any] = {
-            settings.SERIALIZATION_KEYS.ELEMENT_TYPE.value: self.element_type,
-            settings.SERIALIZATION_KEYS.ELEMENT_ID.value: self.element_id,
-            settings.SERIALIZATION_KEYS.POSITION.value: [
+            _KEY_TYPE: self.element_type,
+            _KEY_ID: self.element_id,
+            _KEY_POSITION: [
                 self.position.x,
                 self.position.y,
                 self.position.pressure,
             ],
-            settings.SERIALIZATION_KEYS.DURATION.value: self.duration,
-            settings.SERIALIZATION_KEYS.PATH.value: self.audio_path,
-            settings.SERIALIZATION_KEYS.TRANSCRIPT.value: self.transcript,
-            settings.SERIALIZATION_KEYS.CREATED_AT.value: self.created_at,
-            settings.SERIALIZATION_KEYS.WIDTH.value: self.width,
-            settings.SERIALIZATION_KEYS.HEIGHT.value: self.height,
+            _KEY_DURATION: self.duration,
+            _KEY_PATH: self.audio_path,
+            _KEY_TRANSCRIPT: self.transcript,
+            _KEY_CREATED_AT: self.created_at,
+            _KEY_WIDTH: self.width,
+            _KEY_HEIGHT: self.height,
         }
 
         # Use asset_id if available, otherwise fall back to inline data
         if self.asset_id:
-            result[settings.SERIALIZATION_KEYS.ASSET_ID.value] = self.asset_id
+            result[_KEY_ASSET_ID] = self.asset_id
         elif self.audio_data:
-            result[settings.SERIALIZATION_KEYS.DATA.value] = self.audio_data.hex()
+            result[_KEY_DATA] = self.audio_data.hex()
 
         return result
 
@@ -68,20 +101,18 @@ class VoiceMemo(PageElement):
     def from_dict(cls, data: dict[str, Any]) -> "VoiceMemo":
         """Deserialize this voice memo from a dictionary loaded from JSON"""
         # Support both new format (serialization keys) and legacy short keys
-        pos_key = settings.SERIALIZATION_KEYS.POSITION.value
-        position_data: list[float] = data.get(pos_key) or data.get("p", [0, 0, 1])
+        position_data: list[float] = data.get(_KEY_POSITION) or data.get("p", [0, 0, 1])
         position = Point(
             x=position_data[0], y=position_data[1], pressure=position_data[2]
         )
 
         # Check for asset_id first (new format)
-        asset_id = data.get(settings.SERIALIZATION_KEYS.ASSET_ID.value)
+        asset_id = data.get(_KEY_ASSET_ID)
         audio_data = None
 
         # Fall back to inline data if no asset_id
         if not asset_id:
-            data_key = settings.SERIALIZATION_KEYS.DATA.value
-            raw_data = data.get(data_key) or data.get("d")
+            raw_data = data.get(_KEY_DATA) or data.get("d")
             if raw_data:
                 try:
                     audio_data = bytes.fromhex(raw_data)
@@ -89,31 +120,25 @@ class VoiceMemo(PageElement):
                     audio_data = None
 
         # Get other fields with fallback to legacy keys
-        duration_key = settings.SERIALIZATION_KEYS.DURATION.value
-        path_key = settings.SERIALIZATION_KEYS.PATH.value
-        transcript_key = settings.SERIALIZATION_KEYS.TRANSCRIPT.value
-        created_key = settings.SERIALIZATION_KEYS.CREATED_AT.value
-        width_key = settings.SERIALIZATION_KEYS.WIDTH.value
-        height_key = settings.SERIALIZATION_KEYS.HEIGHT.value
-        id_key = settings.SERIALIZATION_KEYS.ELEMENT_ID.value
-
         return cls(
             position=position,
-            duration=cast(float, data.get(duration_key) or data.get("du", 0.0)),
-            audio_path=data.get(path_key) or data.get("ap"),
+            duration=cast(float, data.get(_KEY_DURATION) or data.get("du", 0.0)),
+            audio_path=data.get(_KEY_PATH) or data.get("ap"),
             audio_data=audio_data,
-            transcript=data.get(transcript_key) or data.get("t"),
-            created_at=data.get(created_key) or data.get("c"),
-            width=cast(float, data.get(width_key) or data.get("w", 50.0)),
-            height=cast(float, data.get(height_key) or data.get("h", 50.0)),
-            element_id=data.get(id_key) or data.get("id"),
+            transcript=data.get(_KEY_TRANSCRIPT) or data.get("t"),
+            created_at=data.get(_KEY_CREATED_AT) or data.get("c"),
+            width=cast(float, data.get(_KEY_WIDTH) or data.get("w", 50.0)),
+            height=cast(float, data.get(_KEY_HEIGHT) or data.get("h", 50.0)),
+            element_id=data.get(_KEY_ID) or data.get("id"),
             asset_id=asset_id,
         )
 
     @override
     def __eq__(self, other: object, /) -> bool:
-        if not other or not isinstance(other, VoiceMemo):
-            return False
+        if self is other:
+            return True
+        if not isinstance(other, VoiceMemo):
+            return NotImplemented
 
         # Use fast UUID check from parent class
         parent_result = super().__eq__(other)
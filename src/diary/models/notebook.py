@@ -10,6 +10,13 @@ from typing import Any, override
 from diary.config import settings
 from diary.models.page import Page
 
+_LOGGER: logging.Logger = logging.getLogger("Notebook")
+
+# Resolve the serialization keys once, not on every call through the Enum
+_KEY_PAGES: str = settings.SERIALIZATION_KEYS.PAGES.value
+_KEY_METADATA: str = settings.SERIALIZATION_KEYS.METADATA.value
+_KEY_NOTEBOOK_ID: str = settings.SERIALIZATION_KEYS.NOTEBOOK_ID.value
+
 
 @dataclass
 class Notebook:
@@ -38,9 +45,7 @@ class Notebook:
             prev_page = self.pages[actual_idx - 1]
             page.streak_lvl = self._calculate_streak_level(page, prev_page)
 
-        logging.getLogger("Notebook").debug(
-            "Created new page with streak lvl: %d", page.streak_lvl
-        )
+        _LOGGER.debug("Created new page with streak lvl: %d", page.streak_lvl)
         if page_idx == -1:
             self.pages.append(page)
         else:
@@ -53,7 +58,7 @@ class Notebook:
         """Remove a page at the specified index. Returns True if successful."""
         if 0 <= page_index < len(self.pages):
             _ = self.pages.pop(page_index)
-            logging.getLogger("Notebook").debug("Removed page at index: %d", page_index)
+            _LOGGER.debug("Removed page at index: %d", page_index)
             return True
         return False
 
@@ -94,9 +99,7 @@ class Notebook:
         # Recalculate all subsequent pages
         self._update_subsequent_streaks(1)
 
-        logging.getLogger("Notebook").info(
-            "Fixed streak levels for %d pages", len(self.pages)
-        )
+        _LOGGER.info("Fixed streak levels for %d pages", len(self.pages))
 
     def update_page_streak(self, page_idx: int) -> None:
         """Update the streak level for a specific page and all subsequent pages.
@@ -128,11 +131,9 @@ class Notebook:
     def to_dict(self):
         """Returns the object as a dict[str, dict]"""
         return {
-            settings.SERIALIZATION_KEYS.PAGES.value: [
-                page.to_dict() for page in self.pages
-            ],
-            settings.SERIALIZATION_KEYS.METADATA.value: self.metadata,
-            settings.SERIALIZATION_KEYS.NOTEBOOK_ID.value: self.notebook_id,
+            _KEY_PAGES: [page.to_dict() for page in self.pages],
+            _KEY_METADATA: self.metadata,
+            _KEY_NOTEBOOK_ID: self.notebook_id,
         }
 
     @classmethod
@@ -143,11 +144,8 @@ class Notebook:
             notebook_id = data["id"]
 
         return cls(
-            [
-                Page.from_dict(page)
-                for page in data[settings.SERIALIZATION_KEYS.PAGES.value]
-            ],
-            data[settings.SERIALIZATION_KEYS.METADATA.value],
+            [Page.from_dict(page) for page in data[_KEY_PAGES]],
+            data[_KEY_METADATA],
             notebook_id,
         )
 
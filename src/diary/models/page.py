@@ -6,13 +6,27 @@ import time
 import uuid
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, cast, override
+from typing import Any, Callable, cast, override
 
 from diary.config import settings
 
 from .elements import Image, Stroke, Text, Video
 from .page_element import PageElement
 
+_KEY_ELEMENT_TYPE: str = settings.SERIALIZATION_KEYS.ELEMENT_TYPE.value
+_KEY_ELEMENTS: str = settings.SERIALIZATION_KEYS.ELEMENTS.value
+_KEY_ID: str = settings.SERIALIZATION_KEYS.ELEMENT_ID.value
+_KEY_CREATED_AT: str = settings.SERIALIZATION_KEYS.CREATED_AT.value
+_KEY_METADATA: str = settings.SERIALIZATION_KEYS.METADATA.value
+_KEY_STREAK_LVL: str = settings.SERIALIZATION_KEYS.STREAK_LVL.value
+
+_ELEMENT_FACTORIES: dict[str, Callable[[dict[str, Any]], PageElement]] = {
+    settings.SERIALIZATION_KEYS.TYPE_STROKE.value: Stroke.from_dict,
+    settings.SERIALIZATION_KEYS.TYPE_IMAGE.value: Image.from_dict,
+    settings.SERIALIZATION_KEYS.TYPE_TEXT.value: Text.from_dict,
+    settings.SERIALIZATION_KEYS.TYPE_VIDEO.value: Video.from_dict,
+}
+
 
 @dataclass
 class Page:
@@ -64,40 +78,53 @@ class Page:
             return False
         return self.page_id == other.page_id
 
-    def to_dict(self) -> dict[str, Any]:
-        """Transforms the object to dict"""
+    def to_dict(self, packed: bool = False) -> dict[str, Any]:
+        """
+        Transforms the object to dict.
+
+        With packed, elements may store bulky data as bytes (see
+        PageElement.to_packed_dict), for msgpack but not JSON.
+        """
+        if packed:
+            elements = [element.to_packed_dict() for element in self.elements]
+        else:
+            elements = [element.to_dict() for element in self.elements]
         return {
-            settings.SERIALIZATION_KEYS.ELEMENTS.value: [
-                element.to_dict() for element in self.elements
-            ],
-            settings.SERIALIZATION_KEYS.ELEMENT_ID.value: self.page_id,
-            settings.SERIALIZATION_KEYS.CREATED_AT.value: self.created_at,
-            settings.SERIALIZATION_KEYS.METADATA.value: self.metadata,
-            settings.SERIALIZATION_KEYS.STREAK_LVL.value: self.streak_lvl,
+            _KEY_ELEMENTS: elements,
+            _KEY_ID: self.page_id,
+            _KEY_CREATED_AT: self.created_at,
+            _KEY_METADATA: self.metadata,
+            _KEY_STREAK_LVL: self.streak_lvl,
         }
 
+    def snapshot(self) -> object:
+        """
+        Cheap value that compares equal as long as the page is unchanged,
+        edits made in place to its elements included (see PageElement.snapshot)
+        """
+        return (
+            [element.snapshot() for element in self.elements],
+            self.created_at,
+            dict(self.metadata),
+            self.streak_lvl,
+        )
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]):
         """Builds the object from dict"""
-        elements: list[PageElement] = []
-
-        for element in cast(
-            list[dict[str, str]], data[settings.SERIALIZATION_KEYS.ELEMENTS.value]
-        ):
-            element_type = element[settings.SERIALIZATION_KEYS.ELEMENT_TYPE.value]
-            if element_type == settings.SERIALIZATION_KEYS.TYPE_STROKE.value:
-                elements.append(Stroke.from_dict(element))
-            elif element_type == settings.SERIALIZATION_KEYS.TYPE_IMAGE.value:
-                elements.append(Image.from_dict(element))
-            elif element_type == settings.SERIALIZATION_KEYS.TYPE_TEXT.value:
-                elements.append(Text.from_dict(element))
-            elif element_type == settings.SERIALIZATION_KEYS.TYPE_VIDEO.value:
-                elements.append(Video.from_dict(element))
+        # One dict lookup per element picks its factory, unknown types are skipped
+        type_key = _KEY_ELEMENT_TYPE
+        get_factory = _ELEMENT_FACTORIES.get
+        elements: list[PageElement] = [
+            factory(element)
+            for element in cast(list[dict[str, Any]], data[_KEY_ELEMENTS])
+            if (factory := get_factory(element[type_key])) is not None
+        ]
 
         return cls(
             elements,
-            data[settings.SERIALIZATION_KEYS.CREATED_AT.value],
-            data[settings.SERIALIZATION_KEYS.ELEMENT_ID.value],
-            data[settings.SERIALIZATION_KEYS.METADATA.value],
-            data.get(settings.SERIALIZATION_KEYS.STREAK_LVL.value, 0),
+            data[_KEY_CREATED_AT],
+            data[_KEY_ID],
+            data[_KEY_METADATA],
+            data.get(_KEY_STREAK_LVL, 0),
         )
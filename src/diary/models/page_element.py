@@ -8,6 +8,10 @@ from typing import Any, override
 class PageElement(ABC):
     """Abstract base class for all elements that can be placed on a page"""
 
+    # Pages hold thousands of elements, avoid a __dict__ per instance. The
+    # subclasses declare their own attributes the same way
+    __slots__ = ("element_type", "element_id")
+
     def __init__(self, element_type: str, element_id: str | None = None):
         self.element_type: str = element_type
         self.element_id: str = element_id or uuid.uuid4().hex
@@ -16,11 +20,32 @@ class PageElement(ABC):
     def to_dict(self) -> dict[str, Any]:
         """Serialize this element to a dictionary for JSON storage"""
 
+    def to_packed_dict(self) -> dict[str, Any]:
+        """
+        Serialize this element for the binary (msgpack) archive.
+
+        Elements with bulky data can pack it into bytes here, from_dict()
+        must accept both forms. Defaults to to_dict().
+        """
+        return self.to_dict()
+
+    def snapshot(self) -> object:
+        """
+        Cheap value that compares equal as long as the element is unchanged,
+        to tell whether an earlier encoding of it is still current. Defaults
+        to to_dict().
+        """
+        return self.to_dict()
+
     @classmethod
     @abstractmethod
     def from_dict(cls, data: dict[str, Any]) -> "PageElement":
         """Deserialize this element from a dictionary loaded from JSON"""
 
+    @override
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.element_id})"
+
     @override
     def __eq__(self, other: object, /) -> bool:
         if not isinstance(other, PageElement):
@@ -8,6 +8,9 @@ from typing import override
 class Point:
     """Represents a Point for ink in the page"""
 
+    # Strokes hold thousands of points, avoid a __dict__ per instance
+    __slots__ = ("x", "y", "pressure")
+
     def __init__(self, x: float, y: float, pressure: float = 1.0):
         self.x: float = x
         self.y: float = y
@@ -21,10 +24,11 @@ class Point:
 
     def to_dict(self):
         """Serialize to [x, y, pressure]"""
+        # round() keeps ints as ints, always write floats like before
         return [
-            float(f"{self.x:.1f}"),
-            float(f"{self.y:.1f}"),
-            float(f"{self.pressure:.1f}"),
+            float(round(self.x, 1)),
+            float(round(self.y, 1)),
+            float(round(self.pressure, 1)),
         ]
 
     @override
@@ -331,6 +331,7 @@ class ImageGraphicsItem(ResizableGraphicsItem):
             image_path=self.image_element.image_path,
             image_data=self.image_element.image_data,
             rotation=self.image_element.rotation,
+            mime_type=self.image_element.mime_type,
         )
         return ImageGraphicsItem(new_image)
 
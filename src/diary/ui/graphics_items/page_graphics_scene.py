@@ -3,7 +3,7 @@
 import logging
 from typing import cast, override
 
-from PyQt6.QtCore import QLineF, QObject, QPointF, QRectF, QTimer, pyqtSignal
+from PyQt6.QtCore import QLineF, QObject, QPointF, QRectF, Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QBrush, QColor, QPainter, QPen
 from PyQt6.QtWidgets import QGraphicsItem, QGraphicsScene
 
@@ -246,15 +246,12 @@ class PageGraphicsScene(QGraphicsScene):
         elements: list[PageElement] = []
 
         try:
-            for graphics_item, element in list(self._item_elements.items()):
-                if graphics_item.scene() is not self:
-                    continue
-                try:
-                    local_point = graphics_item.mapFromScene(point)
-                    if graphics_item.contains(local_point):
-                        elements.append(element)
-                except RuntimeError:
-                    continue
+            # Let the scene's spatial index find the candidates, instead of
+            # mapping the point into every item's coordinates from Python
+            for graphics_item in self.items(point):
+                element = self._item_elements.get(graphics_item)
+                if element is not None:
+                    elements.append(element)
         except RuntimeError as e:
             self._logger.error("RuntimeError accessing items at point: %s", e)
         except Exception as e:
@@ -267,17 +264,12 @@ class PageGraphicsScene(QGraphicsScene):
         elements: list[PageElement] = []
 
         try:
-            for graphics_item, element in list(self._item_elements.items()):
-                if graphics_item.scene() is not self:
-                    continue
-                try:
-                    item_rect = graphics_item.mapToScene(
-                        graphics_item.boundingRect()
-                    ).boundingRect()
-                    if item_rect.intersects(rect):
-                        elements.append(element)
-                except RuntimeError:
-                    continue
+            for graphics_item in self.items(
+                rect, Qt.ItemSelectionMode.IntersectsItemBoundingRect
+            ):
+                element = self._item_elements.get(graphics_item)
+                if element is not None:
+                    elements.append(element)
         except RuntimeError as e:
             self._logger.error("RuntimeError accessing items in rect: %s", e)
         except Exception as e:
@@ -360,6 +352,7 @@ class PageGraphicsScene(QGraphicsScene):
         image_path: str | None = None,
         image_data: bytes | None = None,
         rotation: float = 0.0,
+        mime_type: str | None = None,
     ) -> Image | None:
         """Create a new image element and add it to the scene"""
         image = Image(
@@ -369,6 +362,7 @@ class PageGraphicsScene(QGraphicsScene):
             image_path=image_path,
             image_data=image_data,
             rotation=rotation,
+            mime_type=mime_type,
         )
         graphics_item = self.add_element(image)
         return image if graphics_item else None
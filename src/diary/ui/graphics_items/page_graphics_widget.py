@@ -465,8 +465,13 @@ class PageGraphicsWidget(QtWidgets.QWidget):
                 height,
                 width,
             )
+            # read_image() always re-encodes to PNG, whatever the file was
             _ = self._scene.create_image(
-                point, width / 4, height / 4, image_data=image_bytes
+                point,
+                width / 4,
+                height / 4,
+                image_data=image_bytes,
+                mime_type="image/png",
             )
 
     def _handle_video_input(self, position: QPointF, action: InputAction) -> None:
@@ -506,6 +511,7 @@ class PageGraphicsWidget(QtWidgets.QWidget):
             rotation=0.0,
             video_data=video_bytes,
             thumbnail_data=thumbnail_bytes,
+            thumbnail_mime_type="image/png" if thumbnail_bytes else None,
         )
         _ = self._scene.add_element(video)
 
@@ -313,6 +313,8 @@ class VideoGraphicsItem(ResizableGraphicsItem):
             duration=self.video_element.duration,
             thumbnail_data=self.video_element.thumbnail_data,
             thumbnail_asset_id=self.video_element.thumbnail_asset_id,
+            mime_type=self.video_element.mime_type,
+            thumbnail_mime_type=self.video_element.thumbnail_mime_type,
         )
         new_video.video_data = self.video_element.video_data
         return VideoGraphicsItem(new_video)
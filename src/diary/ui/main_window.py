@@ -77,18 +77,10 @@ class MainWindow(QMainWindow):
 
         if ok and password:
             try:
-                if settings.NOTEBOOK_FILE_PATH.exists():
-                    self.logger.debug("Previous notebook exists, reading salt")
-
-                    file_format = ArchiveDAO.detect_format(settings.NOTEBOOK_FILE_PATH)
-                    if file_format == "archive_v2":
-                        salt = ArchiveDAO.read_salt_from_file(
-                            settings.NOTEBOOK_FILE_PATH
-                        )
-                    else:
-                        salt = SecureEncryption.read_salt_from_file(
-                            settings.NOTEBOOK_FILE_PATH
-                        )
+                # Format and salt come from a single read of the file header
+                _, salt = ArchiveDAO.probe_file(settings.NOTEBOOK_FILE_PATH)
+                if salt is not None:
+                    self.logger.debug("Previous notebook exists, read its salt")
                 else:
                     self.logger.debug(
                         "Previous notebook does not exists, creating new salt"
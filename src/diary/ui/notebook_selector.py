@@ -121,8 +121,12 @@ class NotebookSelector(QWidget):
         delete_btn.setMinimumHeight(50)
 
         def _on_delete():
+            # Log the id, not notebook.to_dict(): that would serialize every
+            # page (even with debug logging off) just to build the message
             logging.getLogger("Selector").debug(
-                "Removing notebook: %s", notebook.to_dict()
+                "Removing notebook %s (%d pages)",
+                notebook.notebook_id,
+                len(notebook.pages),
             )
             if notebook in notebooks:
                 notebooks.remove(notebook)
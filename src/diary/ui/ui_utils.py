@@ -111,18 +111,20 @@ def decimate_stroke_points(
         return stroke_points
 
     decimated: list[Point] = [stroke_points[0]]  # Always keep first point
+    last_x, last_y = stroke_points[0].x, stroke_points[0].y
+    # Compare squared distances, no need for a square root per point
+    min_distance_sq = min_distance * min_distance
 
     for i in range(1, len(stroke_points) - 1):
         current = stroke_points[i]
-        last_kept = decimated[-1]
 
         # Calculate distance from last kept point
-        dx = current.x - last_kept.x
-        dy = current.y - last_kept.y
-        distance = (dx * dx + dy * dy) ** 0.5
+        dx = current.x - last_x
+        dy = current.y - last_y
 
-        if distance >= min_distance:
+        if dx * dx + dy * dy >= min_distance_sq:
             decimated.append(current)
+            last_x, last_y = current.x, current.y
 
     # Always keep last point
     if len(stroke_points) > 1:
@@ -152,17 +154,30 @@ def smooth_stroke_catmull_rom(
     # Add first point
     smoothed.append(stroke_points[0])
 
+    # The basis function coefficients only depend on the tension
+    neg_tension = -tension
+    two_tension = 2 * tension
+    b1_t3 = 2 - tension
+    b1_t2 = tension - 3
+    b2_t3 = tension - 2
+    b2_t2 = 3 - two_tension
+    last = len(stroke_points) - 1
+
     # For each segment between points, create smooth curve
-    for i in range(len(stroke_points) - 1):
+    for i in range(last):
         # Get control points for Catmull-Rom spline
         p0 = stroke_points[max(0, i - 1)]
         p1 = stroke_points[i]
-        p2 = stroke_points[min(len(stroke_points) - 1, i + 1)]
-        p3 = stroke_points[min(len(stroke_points) - 1, i + 2)]
+        p2 = stroke_points[min(last, i + 1)]
+        p3 = stroke_points[min(last, i + 2)]
+        x0, y0, pr0 = p0.x, p0.y, p0.pressure
+        x1, y1, pr1 = p1.x, p1.y, p1.pressure
+        x2, y2, pr2 = p2.x, p2.y, p2.pressure
+        x3, y3, pr3 = p3.x, p3.y, p3.pressure
 
         # Number of interpolation steps based on distance
-        dx = p2.x - p1.x
-        dy = p2.y - p1.y
+        dx = x2 - x1
+        dy = y2 - y1
         segment_length = (dx * dx + dy * dy) ** 0.5
         num_steps = max(2, int(segment_length / 3.0))  # One step every 3 pixels
 
@@ -175,20 +190,15 @@ def smooth_stroke_catmull_rom(
             t3 = t2 * t
 
             # Basis functions for Catmull-Rom
-            b0 = -tension * t3 + 2 * tension * t2 - tension * t
-            b1 = (2 - tension) * t3 + (tension - 3) * t2 + 1
-            b2 = (tension - 2) * t3 + (3 - 2 * tension) * t2 + tension * t
+            b0 = neg_tension * t3 + two_tension * t2 - tension * t
+            b1 = b1_t3 * t3 + b1_t2 * t2 + 1
+            b2 = b2_t3 * t3 + b2_t2 * t2 + tension * t
             b3 = tension * t3 - tension * t2
 
             # Calculate interpolated position
-            x = b0 * p0.x + b1 * p1.x + b2 * p2.x + b3 * p3.x
-            y = b0 * p0.y + b1 * p1.y + b2 * p2.y + b3 * p3.y
-            pressure = (
-                b0 * p0.pressure
-                + b1 * p1.pressure
-                + b2 * p2.pressure
-                + b3 * p3.pressure
-            )
+            x = b0 * x0 + b1 * x1 + b2 * x2 + b3 * x3
+            y = b0 * y0 + b1 * y1 + b2 * y2 + b3 * y3
+            pressure = b0 * pr0 + b1 * pr1 + b2 * pr2 + b3 * pr3
 
             # Clamp pressure to valid range
             pressure = max(0.1, min(1.0, pressure))
@@ -442,7 +452,11 @@ def import_from_pdf() -> list[Page]:
         _ = buffer.open(QIODevice.OpenModeFlag.WriteOnly)
         _ = pixmap.save(buffer, "PNG", quality=100)
         page_img = Image(
-            Point(0, 0), pixmap.width(), pixmap.height(), image_data=image_data.data()
+            Point(0, 0),
+            pixmap.width(),
+            pixmap.height(),
+            image_data=image_data.data(),
+            mime_type="image/png",
         )
         results.append(Page(elements=[page_img]))
     return results
@@ -9,7 +9,7 @@ from diary.models import Notebook
 from diary.models.dao.archive_dao import ArchiveDAO
 from diary.models.dao.migration import ArchiveMigration
 from diary.models.page import Page
-from diary.utils.encryption import SecureBuffer, SecureEncryption
+from diary.utils.encryption import SecureBuffer
 
 
 class LoadWorker(QObject):
@@ -45,11 +45,11 @@ class LoadWorker(QObject):
                 if not self._is_cancelled:
                     self.progress.emit(current, total)
 
-            if not self.file_path.exists():
+            file_format, salt = ArchiveDAO.probe_file(self.file_path)
+            if file_format == "new_file":
                 notebooks = [Notebook([Page()])]
             else:
-                file_format = ArchiveDAO.detect_format(self.file_path)
-                if file_format == "archive_v2":
+                if file_format in ("archive_v2", "archive_v3"):
                     notebooks, assets_by_notebook = ArchiveDAO.load_all(
                         self.file_path,
                         self.key_buffer,
@@ -57,7 +57,7 @@ class LoadWorker(QObject):
                     )
                 else:
                     if self.salt is None:
-                        self.salt = SecureEncryption.read_salt_from_file(self.file_path)
+                        self.salt = salt
                     notebooks, assets_by_notebook = ArchiveMigration.migrate_notebooks(
                         self.file_path,
                         self.file_path,
@@ -41,6 +41,10 @@ class SaveManager(QObject):
         self.is_notebook_dirty: bool = False
         self.is_saving: bool = False
 
+        # Snapshot and encoded bytes of each page as of the last save, by
+        # page_id. Saves reuse the bytes of pages that still match
+        self._page_bytes: dict[str, tuple[object, bytes]] = {}
+
         # Threading
         self.save_thread: QThread | None = None
         self.save_worker: SaveWorker | None = None
@@ -48,7 +52,7 @@ class SaveManager(QObject):
         # Auto-save timer
         self.auto_save_timer: QTimer = QTimer()
         self.auto_save_timer.setInterval(1000 * settings.AUTOSAVE_NOTEBOOK_TIMEOUT)
-        _ = self.auto_save_timer.timeout.connect(self.save_async)
+        _ = self.auto_save_timer.timeout.connect(self._auto_save)
         self.auto_save_timer.start()
 
     def mark_dirty(self) -> None:
@@ -82,6 +86,7 @@ class SaveManager(QObject):
                     self.file_path,
                     self.key_buffer,
                     self.salt,
+                    cached_page_bytes=self._page_bytes,
                 )
             self.is_notebook_dirty = False
 
@@ -93,18 +98,22 @@ class SaveManager(QObject):
             self.logger.error("Error saving notebook: %s", e)
             self.save_error.emit(str(e))
 
-    def save_async(self) -> None:
+    def save_async(self, durable: bool = True) -> None:
         """Save notebook in separate thread"""
         if self.is_saving or not self.is_notebook_dirty:
             return
 
         self.is_saving = True
-        self._setup_save_worker()
+        self._setup_save_worker(durable)
         self.logger.debug("Starting async save")
         if self.save_thread:
             self.save_thread.start()
 
-    def _setup_save_worker(self) -> None:
+    def _auto_save(self) -> None:
+        """Periodic save, skipping fsync since the next one is never far off"""
+        self.save_async(durable=False)
+
+    def _setup_save_worker(self, durable: bool = True) -> None:
         """Setup the save worker and thread"""
         self.save_thread = QThread()
         self.save_worker = SaveWorker(
@@ -112,6 +121,8 @@ class SaveManager(QObject):
             self.file_path,
             self.key_buffer,
             self.salt,
+            self._page_bytes,
+            durable,
         )
         self.save_worker.moveToThread(self.save_thread)
 
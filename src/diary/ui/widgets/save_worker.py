@@ -25,12 +25,16 @@ class SaveWorker(QObject):
         file_path: Path,
         key_buffer: SecureBuffer,
         salt: bytes,
+        page_bytes: dict[str, tuple[object, bytes]] | None = None,
+        durable: bool = True,
     ):
         super().__init__()
         self.all_notebooks: list[Notebook] = all_notebooks
         self.file_path: Path = file_path
         self.key_buffer: SecureBuffer = key_buffer
         self.salt: bytes = salt
+        self.page_bytes: dict[str, tuple[object, bytes]] | None = page_bytes
+        self.durable: bool = durable
         self._is_cancelled: bool = False
         self.logger: logging.Logger = logging.getLogger("SaveWorker")
         self.backup_manager: BackupManager = BackupManager()
@@ -57,6 +61,8 @@ class SaveWorker(QObject):
                     self.file_path,
                     self.key_buffer,
                     self.salt,
+                    cached_page_bytes=self.page_bytes,
+                    durable=self.durable,
                 )
 
             self.logger.debug("Creating backup...")
@@ -1,8 +1,10 @@
 """Enum with the tools available in the application"""
 
 from enum import Enum
+from typing import TYPE_CHECKING
 
-from PyQt6.QtCore import Qt
+if TYPE_CHECKING:
+    from PyQt6.QtCore import Qt
 
 
 class Tool(Enum):
@@ -18,8 +20,11 @@ class Tool(Enum):
     SELECTION = "SELECTION"
 
 
-def get_cursor_from_tool(tool: Tool) -> Qt.CursorShape:
+def get_cursor_from_tool(tool: Tool) -> "Qt.CursorShape":
     """Get the cursor corresponding to a Tool"""
+    # Imported here so that diary.config can use Tool without loading Qt
+    from PyQt6.QtCore import Qt
+
     cursor: Qt.CursorShape
     match tool:
         case Tool.TEXT:
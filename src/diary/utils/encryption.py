@@ -3,10 +3,14 @@ Encrypt and decrypt data with Argon2ID and XChaCha20-Poly1305
 """
 
 import logging
+import mmap
 import os
 import secrets
 import struct
 import tempfile
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from typing import Callable, cast
 
@@ -14,12 +18,21 @@ import nacl
 import nacl.secret
 from argon2.low_level import Type, hash_secret_raw
 
+_LOGGER: logging.Logger = logging.getLogger("Encryption")
+
+# Precompiled little-endian codecs for the header version, the chunk length
+# prefixes and the chunk-number part of the nonces
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+
 
 class SecureBuffer:
     """Wrapper for sensitive data that zeros memory on deletion"""
 
     def __init__(self, data: bytes):
         self._data: bytearray = bytearray(data)
+        self._box: nacl.secret.Aead | None = None
 
     def __bytes__(self):
         return bytes(self._data)
@@ -33,12 +46,49 @@ class SecureBuffer:
             for i, _ in enumerate(self._data):
                 self._data[i] = 0
 
+    def box(self) -> nacl.secret.Aead:
+        """The AEAD box for this key, built on first use and shared afterwards"""
+        if self._box is None:
+            self._box = nacl.secret.Aead(bytes(self._data))
+        return self._box
+
     def wipe(self):
         """Explicitly wipe the data"""
+        # Drop the cached box too, it holds its own copy of the key
+        self._box = None
         for i, _ in enumerate(self._data):
             self._data[i] = 0
 
 
+class ChunkIteratorReader:
+    """
+    Minimal read-only file object over an iterator of byte chunks.
+
+    Lets the zstd stream reader pull decrypted chunks as it needs them.
+    """
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks: Iterator[bytes] = chunks
+        self._pending: bytes = b""
+
+    def read(self, size: int = -1) -> bytes:
+        """Return up to size bytes, at most one chunk at a time"""
+        if size < 0:
+            data = self._pending + b"".join(self._chunks)
+            self._pending = b""
+            return data
+
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return b""
+            self._pending = chunk
+
+        data = self._pending[:size]
+        self._pending = self._pending[size:]
+        return data
+
+
 class SecureEncryption:
     """
     Secure file encryption using Argon2id for key derivation and
@@ -47,10 +97,12 @@ class SecureEncryption:
 
     # Constants
     CHUNK_SIZE: int = 64 * 1024  # 64 KB chunks
+    IO_BUFFER_SIZE: int = 1024 * 1024  # 1 MB file buffer, spans many chunks
     SALT_SIZE: int = 32  # 256 bits
     NONCE_SIZE: int = 24  # 192 bits for XChaCha20
     KEY_SIZE: int = 32  # 256 bits
     TAG_SIZE: int = 16  # 128 bits for Poly1305 MAC
+    PARALLEL_CHUNKS: int = 64  # Chunks encrypted concurrently (4 MB window)
 
     # Argon2id parameters (OWASP recommended minimums for 2023+)
     ARGON2_TIME_COST: int = 2  # iterations
@@ -62,10 +114,11 @@ class SecureEncryption:
 
     # File format magic bytes
     MAGIC: bytes = b"SECENC01"
+    HEADER_SIZE: int = len(MAGIC) + 2 + SALT_SIZE  # magic + version + salt
 
     def __init__(self):
         """Initialize the encryption system"""
-        self.logger: logging.Logger = logging.getLogger("Encryption")
+        self.logger: logging.Logger = _LOGGER
 
     @staticmethod
     def derive_key(password: str, salt: bytes) -> SecureBuffer:
@@ -79,12 +132,12 @@ class SecureEncryption:
         Returns:
             SecureBuffer containing derived key
         """
-        logging.getLogger("Encryption").debug("Encoding password")
+        _LOGGER.debug("Encoding password")
         # Convert password to bytes
         password_bytes = password.encode("utf-8")
 
         try:
-            logging.getLogger("Encryption").debug("Deriving encryption key...")
+            _LOGGER.debug("Deriving encryption key...")
             # Derive key using Argon2id
             raw_key = hash_secret_raw(
                 secret=password_bytes,
@@ -120,32 +173,82 @@ class SecureEncryption:
         input_path = Path(input_path)
 
         if not input_path.exists():
-            logging.getLogger("Encryption").error(
-                "Input file not found when reading salt..."
-            )
+            _LOGGER.error("Input file not found when reading salt...")
             raise FileNotFoundError(f"Input file not found: {input_path}")
 
         with open(input_path, "rb") as infile:
-            # Read and verify header
-            magic = infile.read(len(SecureEncryption.MAGIC))
-            if magic != SecureEncryption.MAGIC:
-                logging.getLogger("Encryption").error("Wrong magic bytes!")
-                raise ValueError("Invalid file format: wrong magic bytes")
-
-            version_bytes = infile.read(2)
-            version: int = cast(int, struct.unpack("<H", version_bytes)[0])
-            if version != SecureEncryption.VERSION:
-                logging.getLogger("Encryption").error("Unsupported version!")
-                raise ValueError(f"Unsupported file version: {version}")
-
-            # Read salt
-            salt = infile.read(SecureEncryption.SALT_SIZE)
-            if len(salt) != SecureEncryption.SALT_SIZE:
-                logging.getLogger("Encryption").error("Invalid salt size!")
-                raise ValueError("Invalid file format: truncated salt")
-
-            logging.getLogger("Encryption").debug("Salt read correctly!")
-            return salt
+            header = infile.read(SecureEncryption.HEADER_SIZE)
+        return SecureEncryption.salt_from_header(header)
+
+    @staticmethod
+    def salt_from_header(header: bytes) -> bytes:
+        """
+        Verify an encrypted file header (magic + version + salt)
+
+        Args:
+            header: The first HEADER_SIZE bytes of the file
+
+        Returns:
+            Salt bytes
+
+        Raises:
+            ValueError: If file format is invalid
+        """
+        magic = header[: len(SecureEncryption.MAGIC)]
+        if magic != SecureEncryption.MAGIC:
+            _LOGGER.error("Wrong magic bytes!")
+            raise ValueError("Invalid file format: wrong magic bytes")
+
+        version_bytes = header[len(magic) : len(magic) + _U16.size]
+        if len(version_bytes) != _U16.size:
+            _LOGGER.error("Truncated header!")
+            raise ValueError("Invalid file format: truncated header")
+        version: int = cast(int, _U16.unpack(version_bytes)[0])
+        if version != SecureEncryption.VERSION:
+            _LOGGER.error("Unsupported version!")
+            raise ValueError(f"Unsupported file version: {version}")
+
+        salt = header[len(magic) + _U16.size : SecureEncryption.HEADER_SIZE]
+        if len(salt) != SecureEncryption.SALT_SIZE:
+            _LOGGER.error("Invalid salt size!")
+            raise ValueError("Invalid file format: truncated salt")
+
+        _LOGGER.debug("Salt read correctly!")
+        return salt
+
+    @staticmethod
+    def encrypt_chunk(box: nacl.secret.Aead, chunk: bytes, chunk_number: int) -> bytes:
+        """Encrypt one chunk, the nonce is random bytes + the chunk number"""
+        nonce_base = secrets.token_bytes(SecureEncryption.NONCE_SIZE - 8)
+        nonce = nonce_base + _U64.pack(chunk_number)
+        return box.encrypt(chunk, nonce=nonce)
+
+    @staticmethod
+    def encrypt_chunks(
+        box: nacl.secret.Aead, data: bytes, chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[tuple[int, bytes]]:
+        """
+        Encrypt data in chunks, yielding (plaintext size, encrypted chunk) in order
+
+        Every chunk has its own nonce, so they are independent. libsodium
+        releases the GIL, so windows of PARALLEL_CHUNKS chunks are encrypted
+        on a thread pool while only one window is kept in memory.
+        """
+        offsets = range(0, len(data), chunk_size)
+        window_size = SecureEncryption.PARALLEL_CHUNKS
+        with ThreadPoolExecutor() as executor:
+            for first in range(0, len(offsets), window_size):
+                chunks = [
+                    data[offset : offset + chunk_size]
+                    for offset in offsets[first : first + window_size]
+                ]
+                encrypted = executor.map(
+                    SecureEncryption.encrypt_chunk,
+                    repeat(box),
+                    chunks,
+                    range(first, first + len(chunks)),
+                )
+                yield from zip(map(len, chunks), encrypted)
 
     @staticmethod
     def encrypt_bytes_to_file(
@@ -164,9 +267,7 @@ class SecureEncryption:
             password: Encryption password
             progress_callback: Optional callback(bytes_processed, total_bytes)
         """
-        logging.getLogger("Encryption").debug(
-            "Encrypting and saving notebook to %s...", output_path
-        )
+        _LOGGER.debug("Encrypting and saving notebook to %s...", output_path)
         output_path = Path(output_path)
 
         # Convert JSON string to bytes
@@ -174,53 +275,36 @@ class SecureEncryption:
         bytes_processed = 0
 
         # Create cipher
-        box = nacl.secret.Aead(bytes(key_buffer))
+        box = key_buffer.box()
 
         # Write to temporary file first for atomic operation
         output_dir = output_path.parent
         with tempfile.NamedTemporaryFile(
-            suffix=".tmp", dir=output_dir, delete=False
+            suffix=".tmp",
+            dir=output_dir,
+            delete=False,
+            buffering=SecureEncryption.IO_BUFFER_SIZE,
         ) as temp_file:
             temp_path = temp_file.name
-            logging.getLogger("Encryption").debug(
-                "Writing to temporary file: %s", temp_path
-            )
+            _LOGGER.debug("Writing to temporary file: %s", temp_path)
 
             try:
                 # Write header: magic + version + salt
                 _ = temp_file.write(SecureEncryption.MAGIC)
-                _ = temp_file.write(struct.pack("<H", SecureEncryption.VERSION))
+                _ = temp_file.write(_U16.pack(SecureEncryption.VERSION))
                 _ = temp_file.write(salt)
 
                 # Encrypt and write chunks
-                chunk_number = 0
-                offset = 0
-
-                logging.getLogger("Encryption").debug(
-                    "Starting chunk encryption process..."
-                )
-                while offset < total_size:
-                    # Get next chunk
-                    chunk_end = min(offset + SecureEncryption.CHUNK_SIZE, total_size)
-                    chunk = data_bytes[offset:chunk_end]
-
-                    # Generate unique nonce for this chunk
-                    # Using chunk number + random bytes for nonce
-                    nonce_base = secrets.token_bytes(SecureEncryption.NONCE_SIZE - 8)
-                    nonce = nonce_base + struct.pack("<Q", chunk_number)
-
-                    # Encrypt chunk (includes MAC tag)
-                    encrypted_chunk = box.encrypt(chunk, nonce=nonce)
-
+                _LOGGER.debug("Starting chunk encryption process...")
+                for plain_size, encrypted_chunk in SecureEncryption.encrypt_chunks(
+                    box, data_bytes
+                ):
                     # Write chunk size + encrypted data
                     chunk_size = len(encrypted_chunk)
-                    _ = temp_file.write(struct.pack("<I", chunk_size))
+                    _ = temp_file.write(_U32.pack(chunk_size))
                     _ = temp_file.write(encrypted_chunk)
 
-                    bytes_processed += len(chunk)
-                    offset = chunk_end
-                    chunk_number += 1
-
+                    bytes_processed += plain_size
                     if progress_callback:
                         progress_callback(bytes_processed, total_size)
 
@@ -240,21 +324,21 @@ class SecureEncryption:
             if output_path.exists():
                 os.unlink(output_path)
             os.rename(temp_path, output_path)
-            logging.getLogger("Encryption").debug("Atomic move completed")
+            _LOGGER.debug("Atomic move completed")
         except (IOError, OSError) as e:
             # Clean up temp file if move fails
             try:
                 os.unlink(temp_path)
             except OSError:
                 pass
-            logging.getLogger("Encryption").error("Atomic move failed: %s", e)
+            _LOGGER.error("Atomic move failed: %s", e)
             raise
 
         # Zero out data bytes
         data_bytes_arr = bytearray(data_bytes)
         for i, _ in enumerate(data_bytes):
             data_bytes_arr[i] = 0
-        logging.getLogger("Encryption").debug("Encryption completed...")
+        _LOGGER.debug("Encryption completed...")
 
     @staticmethod
     def decrypt_file(
@@ -276,100 +360,97 @@ class SecureEncryption:
         Raises:
             ValueError: If file format is invalid or decryption fails
         """
-        logging.getLogger("Encryption").debug("Decrypting file %s...", input_path)
-        input_path = Path(input_path)
-
-        if not input_path.exists():
-            logging.getLogger("Encryption").error("File not found!")
-            raise FileNotFoundError(f"Input file not found: {input_path}")
-
-        file_size = input_path.stat().st_size
-        bytes_processed = 0
-
-        # Collect decrypted chunks
-        decrypted_chunks: list[bytes] = []
-
-        with open(input_path, "rb") as infile:
-            # Read and verify header
-            magic = infile.read(len(SecureEncryption.MAGIC))
-            if magic != SecureEncryption.MAGIC:
-                logging.getLogger("Encryption").error(
-                    "Wrong magic bytes (%s)!", magic.decode()
-                )
-                raise ValueError("Invalid file format: wrong magic bytes")
-
-            version_bytes = infile.read(2)
-            version: int = cast(int, struct.unpack("<H", version_bytes)[0])
-            if version != SecureEncryption.VERSION:
-                logging.getLogger("Encryption").error("Wrong version (%d)!", version)
-                raise ValueError(f"Unsupported file version: {version}")
-
-            # Skip salt
-            salt = infile.read(SecureEncryption.SALT_SIZE)
-            if len(salt) != SecureEncryption.SALT_SIZE:
-                logging.getLogger("Encryption").error(
-                    "Wrong salt size (%d)!", len(salt)
+        return SecureEncryption.combine_decrypted_chunks(
+            list(
+                SecureEncryption.iter_decrypted_chunks(
+                    input_path, key_buffer, progress_callback
                 )
-                raise ValueError("Invalid file format: truncated salt")
+            )
+        )
+
+    @staticmethod
+    def iter_decrypted_chunks(
+        input_path: Path,
+        key_buffer: SecureBuffer,
+        progress_callback: Callable[[int, int], None] | None = None,
+    ) -> Iterator[bytes]:
+        """
+        Decrypt a file chunk by chunk, so callers can consume the plaintext
+        without holding all of it (or the ciphertext) in memory
 
-            box = nacl.secret.Aead(bytes(key_buffer))
+        Args:
+            input_path: Path to encrypted file
+            key_buffer: Already derived encryption key
+            progress_callback: Optional callback(bytes_processed, total_bytes)
 
-            # Decrypt chunks
-            while True:
-                # Read chunk size
-                chunk_size_bytes = infile.read(4)
-                if not chunk_size_bytes:
-                    break  # End of file
+        Yields:
+            Decrypted chunks, in order
 
-                if len(chunk_size_bytes) < 4:
-                    logging.getLogger("Encryption").error(
-                        "Truncated chunk size (%d)!", len(chunk_size_bytes)
-                    )
-                    raise ValueError("Invalid file format: truncated chunk size")
+        Raises:
+            ValueError: If file format is invalid or decryption fails
+        """
+        _LOGGER.debug("Decrypting file %s...", input_path)
+        input_path = Path(input_path)
 
-                chunk_size = cast(int, struct.unpack("<I", chunk_size_bytes)[0])
+        if not input_path.exists():
+            _LOGGER.error("File not found!")
+            raise FileNotFoundError(f"Input file not found: {input_path}")
 
-                # Sanity check on chunk size
-                if (
-                    chunk_size
-                    > SecureEncryption.CHUNK_SIZE
+        with open(input_path, "rb") as infile:
+            file_size = os.fstat(infile.fileno()).st_size
+            header = infile.read(SecureEncryption.HEADER_SIZE)
+            _ = SecureEncryption.salt_from_header(header)
+            if file_size == SecureEncryption.HEADER_SIZE:
+                return
+
+            # Map the file and slice the chunks out of it, instead of a pair
+            # of read() calls per chunk
+            with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                box = key_buffer.box()
+                pos = SecureEncryption.HEADER_SIZE
+                max_chunk = (
+                    SecureEncryption.CHUNK_SIZE
                     + SecureEncryption.NONCE_SIZE
                     + SecureEncryption.TAG_SIZE
                     + 100
-                ):
-                    logging.getLogger("Encryption").error(
-                        "Chunk size too large (%d)", chunk_size
-                    )
-                    raise ValueError("Invalid file format: chunk size too large")
-
-                # Read encrypted chunk
-                encrypted_chunk = infile.read(chunk_size)
-                if len(encrypted_chunk) != chunk_size:
-                    logging.getLogger("Encryption").error(
-                        "Truncated chunk! (%d)", len(encrypted_chunk)
-                    )
-                    raise ValueError("Invalid file format: truncated chunk")
+                )
 
-                try:
-                    # Decrypt chunk (verifies MAC automatically)
-                    plaintext = box.decrypt(encrypted_chunk)
-                    decrypted_chunks.append(plaintext)
-                except Exception as e:
-                    logging.getLogger("Encryption").error(
-                        "Decryption failed: wrong password or corrupted date. %s", e
-                    )
-                    raise ValueError(
-                        "Decryption failed: wrong password or corrupted data"
-                    ) from e
-                finally:
-                    encrypted_chunk = bytearray(encrypted_chunk)
-                    for i, _ in enumerate(encrypted_chunk):
-                        encrypted_chunk[i] = 0
-                bytes_processed += chunk_size
-                if progress_callback:
-                    progress_callback(bytes_processed, file_size)
-
-            return SecureEncryption.combine_decrypted_chunks(decrypted_chunks)
+                while pos < file_size:
+                    if file_size - pos < _U32.size:
+                        _LOGGER.error("Truncated chunk size (%d)!", file_size - pos)
+                        raise ValueError("Invalid file format: truncated chunk size")
+
+                    chunk_size = cast(int, _U32.unpack_from(mm, pos)[0])
+                    pos += _U32.size
+
+                    # Sanity check on chunk size
+                    if chunk_size > max_chunk:
+                        _LOGGER.error("Chunk size too large (%d)", chunk_size)
+                        raise ValueError("Invalid file format: chunk size too large")
+
+                    if file_size - pos < chunk_size:
+                        _LOGGER.error("Truncated chunk! (%d)", file_size - pos)
+                        raise ValueError("Invalid file format: truncated chunk")
+
+                    encrypted_chunk = mm[pos : pos + chunk_size]
+                    pos += chunk_size
+
+                    try:
+                        # Decrypt chunk (verifies MAC automatically)
+                        plaintext = box.decrypt(encrypted_chunk)
+                    except Exception as e:
+                        _LOGGER.error(
+                            "Decryption failed: wrong password or corrupted date. %s",
+                            e,
+                        )
+                        raise ValueError(
+                            "Decryption failed: wrong password or corrupted data"
+                        ) from e
+
+                    if progress_callback:
+                        progress_callback(pos, file_size)
+
+                    yield plaintext
 
     @staticmethod
     def combine_decrypted_chunks(decrypted_chunks: list[bytes]):
@@ -382,7 +463,7 @@ class SecureEncryption:
             for i, _ in enumerate(chunk_array):
                 chunk_array[i] = 0
         try:
-            logging.getLogger("Encryption").debug("Decryption completed")
+            _LOGGER.debug("Decryption completed")
             return full_data
         finally:
             full_data = bytearray(full_data)
@@ -1,14 +1,23 @@
 """Tests for the archive-based save system"""
 
+import io
+import secrets
+import struct
+import tarfile
 import tempfile
+from collections.abc import Mapping
 from pathlib import Path
+from typing import cast
 
 import msgpack
-import zstd
+import nacl.secret
+import pytest
+import zstandard
 
 from diary.models.asset import Asset, AssetIndex, AssetType
 from diary.models.dao.archive_dao import ArchiveDAO
 from diary.models.dao.asset_cache import AssetCache
+from diary.models.dao.legacy_loader import load_legacy_notebooks
 from diary.models.dao.migration import (
     ArchiveMigration,
     detect_audio_mime_type,
@@ -17,7 +26,10 @@ from diary.models.dao.migration import (
 )
 from diary.models.elements.image import Image
 from diary.models.elements.stroke import Stroke
+from diary.models.elements.text import Text
 from diary.models.elements.video import Video
+from diary.models.elements.voice_memo import VoiceMemo
+from diary.models.manifest import ArchiveManifest
 from diary.models.notebook import Notebook
 from diary.models.page import Page
 from diary.models.point import Point
@@ -31,19 +43,77 @@ def _write_legacy_notebook(
     salt: bytes,
 ) -> None:
     notebook_encoded = msgpack.packb(notebook.to_dict(), use_bin_type=True)
-    compressed_notebook = zstd.ZSTD_compress(notebook_encoded, 3)  # pyright: ignore[reportArgumentType]
+    compressed_notebook = zstandard.ZstdCompressor(level=3).compress(
+        notebook_encoded  # pyright: ignore[reportArgumentType]
+    )
     SecureEncryption.encrypt_bytes_to_file(
         compressed_notebook, filepath, key, salt, None
     )
 
 
+def _write_tar_archive(
+    notebook: Notebook,
+    assets: AssetIndex,
+    filepath: Path,
+    key: SecureBuffer,
+    salt: bytes,
+) -> None:
+    """Write a version 2 archive: one-shot compressed TAR, duplicates hard linked"""
+    prefix = f"notebooks/{notebook.notebook_id}"
+    manifest = ArchiveManifest(
+        notebook_id=notebook.notebook_id,
+        page_ids=[page.page_id for page in notebook.pages],
+        assets=assets.to_manifest_entries(),
+    )
+    entries = [
+        (f"{prefix}/manifest.msgpack", msgpack.packb(manifest.to_dict())),
+        *(
+            (f"{prefix}/pages/{page.page_id}.msgpack", msgpack.packb(page.to_dict()))
+            for page in notebook.pages
+        ),
+    ]
+
+    tar_buffer = io.BytesIO()
+    written_assets: dict[bytes, str] = {}
+    with tarfile.open(fileobj=tar_buffer, mode="w") as tar:
+        for name, data in entries:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)  # pyright: ignore[reportArgumentType]
+            tar.addfile(info, io.BytesIO(data))  # pyright: ignore[reportArgumentType]
+        for asset in assets:
+            info = tarfile.TarInfo(f"{prefix}/assets/{asset.asset_id}.bin")
+            data = asset.data or b""
+            if data in written_assets:
+                info.type = tarfile.LNKTYPE
+                info.linkname = written_assets[data]
+                tar.addfile(info)
+            else:
+                written_assets[data] = info.name
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+
+    compressed = zstandard.ZstdCompressor(level=3).compress(tar_buffer.getvalue())
+    box = nacl.secret.Aead(bytes(key))
+    with open(filepath, "wb") as f:
+        _ = f.write(ArchiveDAO.TAR_MAGIC)
+        _ = f.write(struct.pack("<H", ArchiveDAO.TAR_VERSION))
+        _ = f.write(salt)
+        for number, offset in enumerate(
+            range(0, len(compressed), SecureEncryption.CHUNK_SIZE)
+        ):
+            chunk = compressed[offset : offset + SecureEncryption.CHUNK_SIZE]
+            encrypted_chunk = SecureEncryption.encrypt_chunk(box, chunk, number)
+            _ = f.write(struct.pack("<I", len(encrypted_chunk)))
+            _ = f.write(encrypted_chunk)
+
+
 def _save_single(
     notebook: Notebook,
     assets: AssetIndex,
     filepath: Path,
     key: SecureBuffer,
     salt: bytes,
-    previous_asset_bytes: dict[str, bytes] | None = None,
+    previous_asset_bytes: Mapping[str, bytes] | None = None,
 ) -> None:
     assets_by_notebook = {notebook.notebook_id: assets}
     previous_by_notebook = (
@@ -115,6 +185,20 @@ class TestAsset:
         asset.data = b"modified data"
         assert not asset.verify_checksum()
 
+    def test_create_with_known_checksum(self):
+        """Test that a provided checksum is kept instead of recomputed"""
+        asset = Asset.from_image_bytes(b"image", checksum="precomputed")
+
+        assert asset.checksum == "precomputed"
+
+    def test_checksum_streams_file_objects(self):
+        """Test that hashing a file object matches hashing its bytes"""
+        data = bytes(range(256)) * (Asset.HASH_CHUNK_SIZE // 128 + 3)
+
+        assert Asset.calculate_checksum(io.BytesIO(data)) == (
+            Asset.calculate_checksum(data)
+        )
+
     def test_asset_manifest_roundtrip(self):
         """Test serializing and deserializing asset manifest entry"""
         data = b"test data"
@@ -172,6 +256,18 @@ class TestAssetIndex:
         assert asset1.asset_id in restored
         assert asset2.asset_id in restored
 
+    def test_verify_all_reports_corrupted_assets(self):
+        """Test that verify_all returns only the assets whose data changed"""
+        index = AssetIndex()
+        good = Asset.from_image_bytes(b"good image")
+        bad = Asset.from_audio_bytes(b"original audio")
+        index.add(good)
+        index.add(bad)
+        bad.data = b"tampered audio"
+
+        assert index.verify_all() == [bad.asset_id]
+        assert index.verify_all(parallel=False) == [bad.asset_id]
+
 
 class TestArchiveDAO:
     """Tests for the ArchiveDAO"""
@@ -222,6 +318,56 @@ class TestArchiveDAO:
             assert isinstance(loaded_stroke, Stroke)
             assert len(loaded_stroke.points) == 3
 
+    def test_packed_stroke_points_roundtrip(self):
+        """Packed points keep the 0.1 precision of the JSON form"""
+        stroke = Stroke(
+            points=[Point(0.04, -12.36, 0.5), Point(800.25, 3.0, 1.0)],
+            color="black",
+            size=2.0,
+            tool="pen",
+        )
+        packed = stroke.to_packed_dict()
+        assert isinstance(packed["points"], bytes)
+
+        unpacked = Stroke.from_dict(packed)
+        from_json = Stroke.from_dict(stroke.to_dict())
+        assert [(p.x, p.y, p.pressure) for p in unpacked.points] == [
+            (p.x, p.y, p.pressure) for p in from_json.points
+        ]
+
+    def test_int_coordinates_serialize_as_floats(self):
+        """Points built from ints are written as floats, like the packed form"""
+        point = Point(3, -4, 1)
+        stroke = Stroke(points=[point])
+        for values in (point.to_dict(), stroke.to_dict()["points"][0]):
+            assert values == [3.0, -4.0, 1.0]
+            assert all(type(value) is float for value in values)
+
+    def test_out_of_range_stroke_keeps_list_points(self):
+        """Coordinates that do not fit in int16 tenths are not packed"""
+        stroke = Stroke(points=[Point(0, 0, 1), Point(5000.0, 10, 1)])
+        packed = stroke.to_packed_dict()
+        assert packed == stroke.to_dict()
+        assert Stroke.from_dict(packed).points[1].x == 5000.0
+
+    def test_malformed_stroke_points_are_skipped(self):
+        """A bad point is dropped instead of failing the whole load"""
+        stroke = Stroke.from_dict(
+            {"points": [[1.0, 2.0, 0.5], [3.0, 4.0], None, [5, 6, 1, 0]]}
+        )
+        assert [(p.x, p.y, p.pressure) for p in stroke.points] == [
+            (1.0, 2.0, 0.5),
+            (5.0, 6.0, 1.0),
+        ]
+
+    def test_non_finite_stroke_keeps_list_points(self):
+        """NaN and inf cannot be packed, the stroke keeps the list form"""
+        for value in (float("nan"), float("inf"), -float("inf")):
+            stroke = Stroke(points=[Point(1.0, 2.0, 0.5), Point(3.0, 4.0, value)])
+            packed = stroke.to_packed_dict()
+            assert isinstance(packed["points"], list)
+            assert packed["points"][0] == [1.0, 2.0, 0.5]
+
     def test_save_and_load_with_image_asset(self):
         """Test saving and loading notebook with image asset"""
         notebook = Notebook()
@@ -303,6 +449,222 @@ class TestArchiveDAO:
             assert loaded_video.asset_id == "test_video_asset"
             assert loaded_video.duration == 10.5
 
+    def test_save_and_load_spanning_several_chunk_windows(self):
+        """Test that archives larger than one parallel chunk window roundtrip"""
+        window = SecureEncryption.CHUNK_SIZE * SecureEncryption.PARALLEL_CHUNKS
+        # Random bytes do not compress, so the archive really spans the windows
+        data = secrets.token_bytes(2 * window + 12345)
+        asset = Asset.from_video_bytes(data)
+        assets = AssetIndex()
+        assets.add(asset)
+        notebook = Notebook()
+        notebook.pages.append(Page())
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = Path(tmpdir) / "large.denc"
+            salt = SecureEncryption.generate_salt()
+            key = SecureEncryption.derive_key("testpass", salt)
+
+            _save_single(notebook, assets, filepath, key, salt)
+            _, loaded_assets = _load_single(filepath, key)
+
+            loaded_asset = loaded_assets.get(asset.asset_id)
+            assert loaded_asset is not None
+            assert loaded_asset.data == data
+
+    def test_duplicate_assets_are_stored_once(self):
+        """Test that identical asset bytes are written once and linked after"""
+        data = b"\x89PNG\r\n\x1a\n" + secrets.token_bytes(64 * 1024)
+        first_notebook = Notebook(pages=[Page()])
+        second_notebook = Notebook(pages=[Page()])
+        first_assets = AssetIndex()
+        first_assets.add(Asset.from_image_bytes(data))
+        first_assets.add(Asset.from_image_bytes(data))
+        second_assets = AssetIndex()
+        second_assets.add(Asset.from_image_bytes(data))
+        assets_by_notebook = {
+            first_notebook.notebook_id: first_assets,
+            second_notebook.notebook_id: second_assets,
+        }
+
+        container = io.BytesIO()
+        ArchiveDAO._write_archive_multi(  # pyright: ignore[reportPrivateUsage]
+            container, [first_notebook, second_notebook], assets_by_notebook
+        )
+        assert len(container.getvalue()) < 2 * len(data)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = Path(tmpdir) / "test.denc"
+            salt = SecureEncryption.generate_salt()
+            key = SecureEncryption.derive_key("testpass", salt)
+
+            ArchiveDAO.save_all(
+                [first_notebook, second_notebook], assets_by_notebook, filepath, key, salt
+            )
+            _, loaded_assets = ArchiveDAO.load_all(filepath, key)
+
+            for assets in loaded_assets.values():
+                for asset in assets:
+                    assert asset.data == data
+            assert sum(len(assets) for assets in loaded_assets.values()) == 3
+
+    def test_duplicate_assets_ignore_stale_checksums(self):
+        """Test that assets are deduplicated on their bytes, not a stale checksum"""
+        data = b"\x89PNG\r\n\x1a\n" + secrets.token_bytes(1024)
+        notebook = Notebook(pages=[Page()])
+        assets = AssetIndex()
+        # Loaded from a manifest without its bytes
+        assets.add(
+            Asset(
+                asset_id="empty",
+                asset_type=AssetType.IMAGE,
+                mime_type="image/png",
+                checksum=Asset.calculate_checksum(data),
+            )
+        )
+        # Replaced after its checksum was set
+        replaced = Asset.from_image_bytes(data)
+        replaced.data = b"\x89PNG\r\n\x1a\n" + b"new image data"
+        assets.add(replaced)
+        assets.add(Asset.from_image_bytes(data))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = Path(tmpdir) / "test.denc"
+            salt = SecureEncryption.generate_salt()
+            key = SecureEncryption.derive_key("testpass", salt)
+
+            ArchiveDAO.save_all(
+                [notebook], {notebook.notebook_id: assets}, filepath, key, salt
+            )
+            _, loaded_assets = _load_single(filepath, key)
+
+            for asset in assets:
+                loaded_asset = loaded_assets.get(asset.asset_id)
+                assert loaded_asset is not None
+                assert loaded_asset.data == (asset.data or b"")
+
+    def test_cached_page_bytes_are_reused_and_filled(self):
+        """Test that unchanged pages reuse their bytes and the cache follows the pages"""
+        cached_page = Page(elements=[Stroke(points=[Point(1.0, 2.0, 0.5)])])
+        new_page = Page()
+        notebook = Notebook(pages=[cached_page])
+        cached_page_bytes: dict[str, tuple[object, bytes]] = {}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = Path(tmpdir) / "test.denc"
+            salt = SecureEncryption.generate_salt()
+            key = SecureEncryption.derive_key("testpass", salt)
+
+            def save() -> None:
+                ArchiveDAO.save_all(
+                    [notebook],
+                    {notebook.notebook_id: AssetIndex()},
+                    filepath,
+                    key,
+                    salt,
+                    cached_page_bytes=cached_page_bytes,
+                )
+
+            save()
+            first_bytes = cached_page_bytes[cached_page.page_id][1]
+            notebook.pages.append(new_page)
+            save()
+            loaded_notebook, _ = _load_single(filepath, key)
+
+            assert set(cached_page_bytes) == {cached_page.page_id, new_page.page_id}
+            assert cached_page_bytes[cached_page.page_id][1] is first_bytes
+            assert loaded_notebook.pages[0].elements[0] == cached_page.elements[0]
+
+            _ = notebook.pages.pop(0)
+            save()
+            assert set(cached_page_bytes) == {new_page.page_id}
+
+    def test_cached_page_bytes_pick_up_in_place_edits(self):
+        """Test that elements edited in place are not saved from stale cached bytes"""
+        stroke = Stroke(points=[Point(1.0, 2.0, 0.5), Point(3.0, 4.0, 0.5)])
+        text = Text("before", Point(10.0, 20.0, 0))
+        notebook = Notebook(pages=[Page(elements=[stroke, text])])
+        cached_page_bytes: dict[str, tuple[object, bytes]] = {}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = Path(tmpdir) / "test.denc"
+            salt = SecureEncryption.generate_salt()
+            key = SecureEncryption.derive_key("testpass", salt)
+
+            def save_and_load() -> Page:
+                ArchiveDAO.save_all(
+                    [notebook],
+                    {notebook.notebook_id: AssetIndex()},
+                    filepath,
+                    key,
+                    salt,
+                    cached_page_bytes=cached_page_bytes,
+                )
+                loaded_notebook, _ = _load_single(filepath, key)
+                return loaded_notebook.pages[0]
+
+            _ = save_and_load()
+
+            # What the graphics items do while text is typed, moved or resized
+            text.text = "after"
+            text.position = Point(30.0, 40.0, 0)
+            loaded_page = save_and_load()
+            loaded_text = cast(Text, loaded_page.elements[1])
+            assert loaded_text.text == "after"
+            assert loaded_text.position.x == 30.0
+
+            stroke.points[1] = Point(5.0, 6.0, 0.5)
+            loaded_stroke = cast(Stroke, save_and_load().elements[0])
+            assert loaded_stroke.points[1].x == 5.0
+
+            stroke.rotation = 90.0
+            loaded_stroke = cast(Stroke, save_and_load().elements[0])
+            assert loaded_stroke.rotation == 90.0
+
+    def test_load_version_2_tar_archive(self):
+        """Test loading TAR-based archives written by older versions"""
+        notebook = Notebook()
+        notebook.pages.append(Page(elements=[Stroke(points=[Point(1.0, 2.0, 0.5)])]))
+        data = b"\x89PNG\r\n\x1a\n" + b"image data"
+        assets = AssetIndex()
+        asset = Asset.from_image_bytes(data)
+        duplicate = Asset.from_image_bytes(data)
+        assets.add(asset)
+        assets.add(duplicate)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = Path(tmpdir) / "old.denc"
+            salt = SecureEncryption.generate_salt()
+            key = SecureEncryption.derive_key("testpass", salt)
+
+            _write_tar_archive(notebook, assets, filepath, key, salt)
+            assert ArchiveDAO.detect_format(filepath) == "archive_v2"
+            assert ArchiveDAO.read_salt_from_file(filepath) == salt
+
+            loaded_notebook, loaded_assets = _load_single(filepath, key)
+
+            assert loaded_notebook.notebook_id == notebook.notebook_id
+            assert len(loaded_notebook.pages[0].elements) == 1
+            loaded_duplicate = loaded_assets.get(duplicate.asset_id)
+            assert loaded_duplicate is not None
+            assert loaded_duplicate.data == data
+
+    def test_load_with_wrong_password_fails(self):
+        """Test that decryption errors surface while streaming the load"""
+        notebook = Notebook()
+        notebook.pages.append(Page())
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = Path(tmpdir) / "test.denc"
+            salt = SecureEncryption.generate_salt()
+            key = SecureEncryption.derive_key("testpass", salt)
+            wrong_key = SecureEncryption.derive_key("wrongpass", salt)
+
+            _save_single(notebook, AssetIndex(), filepath, key, salt)
+
+            with pytest.raises(ValueError, match="Decryption failed"):
+                _ = _load_single(filepath, wrong_key)
+
     def test_format_detection(self):
         """Test that format detection works correctly"""
         notebook = Notebook()
@@ -317,7 +679,7 @@ class TestArchiveDAO:
 
             # Save archive format
             _save_single(notebook, assets, archive_path, key, salt)
-            assert ArchiveDAO.detect_format(archive_path) == "archive_v2"
+            assert ArchiveDAO.detect_format(archive_path) == "archive_v3"
 
             # Save legacy format
             _write_legacy_notebook(notebook, legacy_path, key, salt)
@@ -326,6 +688,14 @@ class TestArchiveDAO:
             # Non-existent file
             assert ArchiveDAO.detect_format(Path(tmpdir) / "nonexistent") == "new_file"
 
+            # Probing reads the format and the salt together
+            assert ArchiveDAO.probe_file(archive_path) == ("archive_v3", salt)
+            assert ArchiveDAO.probe_file(legacy_path) == ("encrypted_v1", salt)
+            assert ArchiveDAO.probe_file(Path(tmpdir) / "nonexistent") == (
+                "new_file",
+                None,
+            )
+
 
 class TestAssetCache:
     """Tests for the AssetCache"""
@@ -342,6 +712,35 @@ class TestAssetCache:
         assert asset.asset_id in cache
         assert cache.get_asset_bytes(asset.asset_id) == b"test data"
 
+    def test_set_asset_bytes_skips_unchanged_checksum(self):
+        """Test that re-caching bytes with a known checksum keeps the entry"""
+        cache = AssetCache()
+        cached = b"data"
+        cache.set_asset_bytes("a", cached, "sum")
+
+        assert cache.is_unchanged("a", "sum")
+        assert not cache.is_unchanged("a", "other")
+
+        cache.set_asset_bytes("a", bytes(cached), "sum")
+        assert cache.get_asset_bytes("a") is cached
+
+        cache.set_asset_bytes("a", b"new data", "other")
+        assert cache.get_asset_bytes("a") == b"new data"
+
+    def test_get_all_bytes_is_a_read_only_view(self):
+        """Test that the cached bytes are handed out without copying"""
+        cache = AssetCache()
+        cache.set_asset_bytes("a", b"first")
+        view = cache.get_all_bytes()
+        snapshot = cache.get_all_bytes(copy=True)
+
+        cache.set_asset_bytes("b", b"second")
+
+        assert dict(view) == {"a": b"first", "b": b"second"}
+        assert snapshot == {"a": b"first"}
+        with pytest.raises(TypeError):
+            view["c"] = b"third"  # pyright: ignore[reportIndexIssue]
+
     def test_incremental_save_reuses_bytes(self):
         """Test that incremental saves reuse unchanged asset bytes"""
         notebook = Notebook()
@@ -436,6 +835,82 @@ class TestMigration:
             asset = assets.get(migrated_image.asset_id)
             assert asset.data == image_data  # pyright: ignore[reportOptionalMemberAccess]
 
+    def test_extract_video_with_thumbnail(self):
+        """Test that a video and its thumbnail become one asset each"""
+        notebook = Notebook()
+        page = Page()
+        video = Video(
+            position=Point(0, 0, 1),
+            width=100,
+            height=100,
+            video_data=b"\x00\x00\x00\x18ftypisom" + b"video" * 10,
+            thumbnail_data=b"\x89PNG\r\n\x1a\n" + b"thumb" * 10,
+        )
+        page.add_element(video)
+        notebook.pages.append(page)
+
+        assets = ArchiveMigration.extract_assets_from_notebook(
+            notebook, clear_inline_data=True
+        )
+
+        assert len(assets) == 2
+        assert video.video_data is None
+        assert video.thumbnail_data is None
+        assert assets.get(video.asset_id).mime_type == "video/mp4"  # pyright: ignore[reportOptionalMemberAccess, reportArgumentType]
+        assert assets.get(video.thumbnail_asset_id).mime_type == "image/png"  # pyright: ignore[reportOptionalMemberAccess, reportArgumentType]
+
+    def test_extract_uses_known_mime_type(self):
+        """Test that an element's known MIME type is used instead of sniffing"""
+        notebook = Notebook()
+        page = Page()
+        image = Image(
+            position=Point(0, 0, 1),
+            width=100,
+            height=100,
+            image_data=b"no magic bytes here",
+            mime_type="image/png",
+        )
+        memo = VoiceMemo(
+            position=Point(0, 0, 1),
+            duration=1.0,
+            audio_data=b"no magic bytes either",
+            mime_type="audio/ogg",
+        )
+        page.add_element(image)
+        page.add_element(memo)
+        notebook.pages.append(page)
+
+        assets = ArchiveMigration.extract_assets_from_notebook(notebook)
+
+        assert assets.get(image.asset_id).mime_type == "image/png"  # pyright: ignore[reportOptionalMemberAccess, reportArgumentType]
+        assert assets.get(memo.asset_id).mime_type == "audio/ogg"  # pyright: ignore[reportOptionalMemberAccess, reportArgumentType]
+
+    def test_extract_reuses_checksum_of_same_data(self):
+        """Test that unchanged data is not hashed again on the next extraction"""
+        notebook = Notebook()
+        page = Page()
+        image_data = b"\x89PNG\r\n\x1a\n" + b"image" * 10
+        image = Image(
+            position=Point(0, 0, 1),
+            width=100,
+            height=100,
+            image_data=image_data,
+        )
+        page.add_element(image)
+        notebook.pages.append(page)
+
+        first = ArchiveMigration.extract_assets_from_notebook(notebook)
+        checksum = first.get(image.asset_id).checksum  # pyright: ignore[reportOptionalMemberAccess, reportArgumentType]
+        # A stale cache entry for the same bytes object is trusted...
+        image.data_checksum = (image_data, "cached")
+        second = ArchiveMigration.extract_assets_from_notebook(notebook)
+        assert second.get(image.asset_id).checksum == "cached"  # pyright: ignore[reportOptionalMemberAccess, reportArgumentType]
+
+        # ...but new data is hashed again
+        image.image_data = b"\x89PNG\r\n\x1a\n" + b"other" * 10
+        third = ArchiveMigration.extract_assets_from_notebook(notebook)
+        assert third.get(image.asset_id).checksum not in ("cached", checksum)  # pyright: ignore[reportOptionalMemberAccess, reportArgumentType]
+
     def test_inject_asset_data(self):
         """Test injecting asset data back into elements"""
         notebook = Notebook()
@@ -466,6 +941,8 @@ class TestMigration:
 
         # After injection
         assert image.image_data == b"test data"
+        # The asset's MIME type is kept, so saving doesn't sniff the data again
+        assert image.mime_type == "image/png"
 
 
 class TestMimeTypeDetection:
@@ -589,13 +1066,55 @@ class TestAutoMigration:
                     ArchiveMigration.inject_asset_data(notebook, assets)
 
             # File should now be archive format
-            assert ArchiveDAO.detect_format(filepath) == "archive_v2"
+            assert ArchiveDAO.detect_format(filepath) == "archive_v3"
 
             # Image should still have data (injected from assets)
             loaded_image = loaded[0].pages[0].elements[0]
             assert isinstance(loaded_image, Image)
             assert loaded_image.image_data == image_data
 
+    def test_load_legacy_notebook_list(self):
+        """Test that a legacy file with a list of notebooks loads all of them"""
+        notebooks = [Notebook(pages=[Page()]), Notebook(pages=[Page(), Page()])]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = Path(tmpdir) / "test.enc"
+            salt = SecureEncryption.generate_salt()
+            key = SecureBuffer(secrets.token_bytes(SecureEncryption.KEY_SIZE))
+
+            encoded = msgpack.packb(
+                [notebook.to_dict() for notebook in notebooks], use_bin_type=True
+            )
+            compressed = zstandard.ZstdCompressor(level=3).compress(encoded)  # pyright: ignore[reportArgumentType]
+            SecureEncryption.encrypt_bytes_to_file(compressed, filepath, key, salt)
+
+            loaded = load_legacy_notebooks(filepath, key)
+
+            assert [len(n.pages) for n in loaded] == [1, 2]
+
+    def test_load_legacy_notebook_authenticates_trailing_chunks(self):
+        """Test that chunks after the notebooks are still decrypted and verified"""
+        notebook = Notebook(pages=[Page()])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = Path(tmpdir) / "test.enc"
+            salt = SecureEncryption.generate_salt()
+            key = SecureBuffer(secrets.token_bytes(SecureEncryption.KEY_SIZE))
+
+            encoded = msgpack.packb([notebook.to_dict()], use_bin_type=True)
+            compressed = zstandard.ZstdCompressor(level=3).compress(encoded)  # pyright: ignore[reportArgumentType]
+            # Several chunks the unpacker never needs
+            padding = secrets.token_bytes(4 * SecureEncryption.CHUNK_SIZE)
+            SecureEncryption.encrypt_bytes_to_file(
+                compressed + padding, filepath, key, salt
+            )
+            data = bytearray(filepath.read_bytes())
+            data[-1] ^= 1
+            _ = filepath.write_bytes(bytes(data))
+
+            with pytest.raises(ValueError):
+                _ = load_legacy_notebooks(filepath, key)
+
     def test_load_archive_format_directly(self):
         """Test loading archive format without migration"""
         notebook = Notebook()
@@ -691,6 +1210,13 @@ class TestUnencryptedExport:
                 assert "manifest.json" in names
                 assert any(n.startswith("pages/") for n in names)
                 assert any(n.startswith("assets/") for n in names)
+                # Already compressed media is stored, JSON is deflated
+                assert zf.getinfo("assets/img_123.png").compress_type == (
+                    zipfile.ZIP_STORED
+                )
+                assert zf.getinfo("manifest.json").compress_type == (
+                    zipfile.ZIP_DEFLATED
+                )
 
             # Import
             imported_notebook, imported_assets = ArchiveDAO.import_unencrypted(zip_path)
@@ -772,3 +1298,34 @@ class TestUnencryptedExport:
                 assert "assets/img1.png" in names
                 assert "assets/vid1.mp4" in names
                 assert "assets/aud1.wav" in names
+
+
+class TestChunkedEncryption:
+    """Tests for the parallel chunk encryption"""
+
+    def test_roundtrip_spans_several_windows(self):
+        """Test that chunks encrypted in parallel are written back in order"""
+        chunks = SecureEncryption.PARALLEL_CHUNKS * 2 + 3
+        data = b"".join(
+            i.to_bytes(4, "little") * (SecureEncryption.CHUNK_SIZE // 4)
+            for i in range(chunks)
+        )[:-100]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = Path(tmpdir) / "chunks.enc"
+            salt = SecureEncryption.generate_salt()
+            key = SecureBuffer(secrets.token_bytes(SecureEncryption.KEY_SIZE))
+
+            SecureEncryption.encrypt_bytes_to_file(data, filepath, key, salt)
+
+            assert SecureEncryption.decrypt_file(filepath, key) == data
+
+    def test_box_is_shared_until_wiped(self):
+        """Test that the key's AEAD box is reused and dropped on wipe"""
+        key = SecureBuffer(secrets.token_bytes(SecureEncryption.KEY_SIZE))
+
+        box = key.box()
+        assert key.box() is box
+
+        key.wipe()
+        assert key.box() is not box